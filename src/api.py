@@ -5,6 +5,8 @@ Flask API for serving news data
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from database import Database
+from config import API_PAGE_SIZE, API_MAX_PAGE_SIZE
+from circuit_breaker import CircuitBreaker
 import threading
 import subprocess
 import time
@@ -122,7 +124,7 @@ def run_scraper():
         scraper_status['scraper_type'] = None
         scraper_process = None
 
-def run_historical_scraper():
+def run_historical_scraper(resume=False):
     """Run the historical scraper in a separate thread with real-time logging"""
     global scraper_status, scraper_process
     
@@ -134,8 +136,11 @@ def run_historical_scraper():
         scraper_status['scraper_type'] = 'historical'
         
         # Start the historical scraper process with real-time output
+        command = [sys.executable, 'src/historical_scraper.py']
+        if resume:
+            command.append('--resume')
         scraper_process = subprocess.Popen(
-            [sys.executable, 'src/historical_scraper.py'],
+            command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
@@ -188,30 +193,46 @@ def run_historical_scraper():
 
 @app.route('/api/news')
 def get_news():
-    """Get news articles with optional filters"""
+    """
+    Get a page of news articles with optional filters, or search them with q ranked by relevance
+    
+    Pass the next_cursor of a response as cursor to get the following page; it is
+    null on the last page. limit is capped at API_MAX_PAGE_SIZE.
+    """
     country = request.args.get('country')
     source = request.args.get('source')
     language = request.args.get('language')
-    limit = request.args.get('limit', default=100, type=int)
-
-    with Database() as db:
-        articles = db.get_articles(
-            country=country,
-            source=source,
-            language=language,
-            limit=limit
-        )
+    limit = min(max(request.args.get('limit', default=API_PAGE_SIZE, type=int), 1), API_MAX_PAGE_SIZE)
+    q = request.args.get('q', '').strip() or None
+    cursor = request.args.get('cursor') or None
+    
+    try:
+        with Database(read_only=True) as db:
+            articles, next_cursor = db.get_articles_page(
+                country=country,
+                source=source,
+                language=language,
+                limit=limit,
+                q=q,
+                cursor=cursor
+            )
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     
     return jsonify({
         'status': 'success',
         'count': len(articles),
-        'articles': articles
+        'articles': articles,
+        'next_cursor': next_cursor
     })
 
 @app.route('/api/news/stats')
 def get_stats():
     """Get statistics about collected news data"""
-    with Database() as db:
+    with Database(read_only=True) as db:
         stats = db.get_stats()
     
     return jsonify({
@@ -222,7 +243,7 @@ def get_stats():
 @app.route('/api/news/countries')
 def get_countries():
     """Get list of available countries"""
-    with Database() as db:
+    with Database(read_only=True) as db:
         stats = db.get_stats()
         countries = list(stats['articles_by_country'].keys())
     
@@ -234,7 +255,7 @@ def get_countries():
 @app.route('/api/news/sources')
 def get_sources():
     """Get list of available news sources"""
-    with Database() as db:
+    with Database(read_only=True) as db:
         stats = db.get_stats()
         sources = list(stats['articles_by_source'].keys())
     
@@ -243,6 +264,19 @@ def get_sources():
         'sources': sources
     })
 
+@app.route('/api/scraper/quarantine')
+def get_quarantined_feeds():
+    """Get feeds currently skipped by the circuit breaker"""
+    breaker = CircuitBreaker()
+    breaker.load()
+    feeds = breaker.quarantined()
+    
+    return jsonify({
+        'status': 'success',
+        'count': len(feeds),
+        'feeds': feeds
+    })
+
 @app.route('/api/scraper/start', methods=['POST'])
 def start_scraper():
     """Start the news scraper"""
@@ -347,8 +381,11 @@ def start_historical_scraper():
             'message': 'Scraper is already running'
         }), 400
     
+    # Resume the last interrupted run when requested with {"resume": true}
+    options = request.get_json(silent=True) or {}
+    
     # Start historical scraper in background thread
-    thread = threading.Thread(target=run_historical_scraper)
+    thread = threading.Thread(target=run_historical_scraper, args=(bool(options.get('resume')),))
     thread.daemon = True
     thread.start()
     
@@ -0,0 +1,480 @@
+"""
+Benchmarks for the scraper's hot paths
+
+Usage:
+    python src/benchmark.py parser [--repeat N] [feed.xml ...]
+    python src/benchmark.py dates [--repeat N]
+    python src/benchmark.py encoding [--repeat N]
+    python src/benchmark.py summaries [--repeat N]
+    python src/benchmark.py inserts [--articles N] [--row-articles N]
+    python src/benchmark.py queries [--articles N] [--repeat N]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+from xml.sax.saxutils import escape
+from dateutil.parser import parse as parse_date
+from dateutil.tz import tzutc
+from requests.compat import chardet
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config import SUMMARY_MAX_LENGTH
+from scraper import RSSFeedScraper
+from date_normalizer import DateNormalizer, format_publication_date
+from feed_parser import FeedItem, choose_encoding, extract_text, parse_feed_items
+from feed_profile import FeedProfile
+from database import Database
+
+def print_flush(message):
+    """Print message and flush immediately for real-time logging"""
+    print(message)
+    sys.stdout.flush()
+
+def load_stored_articles() -> List[Dict]:
+    """Load the articles of the most recent JSON export in data/"""
+    exports = sorted(glob.glob("data/articles_*.json"))
+    if not exports:
+        return []
+    with open(exports[-1], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_feed(source: str, articles: List[Dict], feed_format: str) -> str:
+    """
+    Rebuild a feed document in the given format from stored articles
+    
+    Args:
+        source (str): Source name used as the channel title
+        articles (List[Dict]): Articles of the source
+        feed_format (str): 'rss', 'atom' or 'rdf'
+    
+    Returns:
+        str: Feed XML
+    """
+    entries = []
+    for article in articles:
+        title = escape(article['title'])
+        url = escape(article['url'])
+        summary = escape(article['summary'])
+        date = escape(article['publication_date'])
+        
+        if feed_format == 'atom':
+            entries.append(
+                f"<entry><title>{title}</title><link href=\"{url}\"/>"
+                f"<updated>{date}</updated><summary>{summary}</summary></entry>"
+            )
+        elif feed_format == 'rdf':
+            entries.append(
+                f"<item rdf:about=\"{url}\"><title>{title}</title><link>{url}</link>"
+                f"<dc:date>{date}</dc:date><description>{summary}</description></item>"
+            )
+        else:
+            entries.append(
+                f"<item><title>{title}</title><link>{url}</link><pubDate>{date}</pubDate>"
+                f"<description><![CDATA[{article['summary']}]]></description></item>"
+            )
+    
+    body = ''.join(entries)
+    if feed_format == 'atom':
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>{escape(source)}</title>{body}</feed>'
+        )
+    if feed_format == 'rdf':
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+            'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<channel><title>{escape(source)}</title></channel>{body}</rdf:RDF>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0"><channel><title>{escape(source)}</title>{body}</channel></rss>'
+    )
+
+def load_feeds(paths: List[str]) -> List[Tuple[str, str]]:
+    """
+    Collect (name, content) feed documents to benchmark
+    
+    Feed files given on the command line are used as-is. Raw feeds are not kept on
+    disk, so without any the stored article exports are rebuilt into one RSS 2.0,
+    Atom and RSS 1.0 document per source.
+    """
+    feeds = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            feeds.append((os.path.basename(path), f.read()))
+    if feeds:
+        return feeds
+    
+    by_source = defaultdict(list)
+    for article in load_stored_articles():
+        by_source[article['source']].append(article)
+    
+    for source, articles in by_source.items():
+        for feed_format in ('rss', 'atom', 'rdf'):
+            feeds.append((f"{source} ({feed_format})", build_feed(source, articles, feed_format)))
+    return feeds
+
+def time_runs(func: Callable, repeat: int) -> float:
+    """Get the best wall-clock time of several runs of func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_parser(args):
+    """Compare the lxml fast path against the BeautifulSoup item walker, and probing against feed profiles"""
+    feeds = load_feeds(args.feeds)
+    if not feeds:
+        print_flush("No feeds to benchmark: pass feed files or run the scraper to create data/articles_*.json")
+        return
+    
+    scraper = RSSFeedScraper()
+    # Profiles are learned by the first profiled parse and reused afterwards
+    profiles = {name: FeedProfile(name) for name, _ in feeds}
+
+    def parse_all(use_lxml: bool, profiled: bool = False) -> List[List[Dict]]:
+        return [
+            scraper._parse_feed_content(
+                content, name, use_lxml=use_lxml, profile=profiles[name] if profiled else None
+            )
+            for name, content in feeds
+        ]
+    
+    soup_results = parse_all(False)
+    lxml_results = parse_all(True)
+    parse_all(True, profiled=True)
+    profiled_results = parse_all(True, profiled=True)
+    mismatched = [
+        name for (name, _), a, b, c in zip(feeds, soup_results, lxml_results, profiled_results)
+        if not a == b == c
+    ]
+    total_items = sum(len(result) for result in soup_results)
+    
+    soup_time = time_runs(lambda: parse_all(False), args.repeat)
+    lxml_time = time_runs(lambda: parse_all(True), args.repeat)
+    profiled_time = time_runs(lambda: parse_all(True, profiled=True), args.repeat)
+    
+    print_flush(f"Feeds: {len(feeds)}, items: {total_items}")
+    print_flush(f"BeautifulSoup:   {soup_time:.3f}s ({total_items / soup_time:,.0f} items/sec)")
+    print_flush(f"lxml:            {lxml_time:.3f}s ({total_items / lxml_time:,.0f} items/sec)")
+    print_flush(f"lxml + profiles: {profiled_time:.3f}s ({total_items / profiled_time:,.0f} items/sec)")
+    print_flush(f"Speedup: {soup_time / lxml_time:.1f}x (lxml), {soup_time / profiled_time:.1f}x (profiles)")
+    if mismatched:
+        print_flush(f"Output differs for {len(mismatched)} feed(s): {', '.join(mismatched)}")
+    else:
+        print_flush("Output identical for all feeds")
+
+def load_dates() -> List[Tuple[str, str]]:
+    """
+    Collect (feed, date string) pairs from the stored articles
+    
+    Stored dates are all RFC 822 in GMT, so each is also rewritten the way other
+    feeds commonly publish it: with a numeric offset and as ISO 8601.
+    """
+    dates = []
+    for article in load_stored_articles():
+        date = parse_date(article['publication_date'])
+        feed = article['source']
+        dates.append((feed, article['publication_date']))
+        dates.append((f"{feed} (offset)", date.strftime("%a, %d %b %Y %H:%M:%S +0000")))
+        dates.append((f"{feed} (iso)", date.strftime("%Y-%m-%dT%H:%M:%SZ")))
+    return dates
+
+def benchmark_dates(args):
+    """Compare date handling before and after the date normalizer"""
+    dates = load_dates()
+    if not dates:
+        print_flush("No dates to benchmark: run the scraper to create data/articles_*.json")
+        return
+
+    def dateutil_path():
+        # Parse in the scraper, format as GMT, then parse again when storing
+        stored = []
+        for _, date_str in dates:
+            pub_date_str = parse_date(date_str).strftime("%a, %d %b %Y %H:%M:%S GMT")
+            pub_date = parse_date(pub_date_str)
+            if pub_date.tzinfo is None:
+                pub_date = pub_date.replace(tzinfo=tzutc())
+            stored.append(pub_date.isoformat())
+        return stored
+
+    def normalizer_path():
+        # Parse once with the feed's remembered format and store the datetime as is
+        normalizer = DateNormalizer()
+        stored = []
+        for feed, date_str in dates:
+            pub_date = normalizer.parse(date_str, feed)
+            format_publication_date(pub_date)
+            stored.append(pub_date.isoformat())
+        return stored
+    
+    old_time = time_runs(dateutil_path, args.repeat)
+    new_time = time_runs(normalizer_path, args.repeat)
+    
+    print_flush(f"Dates: {len(dates)}")
+    print_flush(f"dateutil (parse twice): {old_time:.3f}s ({len(dates) / old_time:,.0f} articles/sec)")
+    print_flush(f"DateNormalizer:         {new_time:.3f}s ({len(dates) / new_time:,.0f} articles/sec)")
+    print_flush(f"Speedup: {old_time / new_time:.1f}x")
+
+# (encoding, Content-Type) pairs feeds are served with in the encoding benchmark
+SERVED_ENCODINGS = [
+    ('utf-8', 'text/xml'),                           # requests assumes ISO-8859-1
+    ('utf-8', 'application/rss+xml'),                # requests runs charset detection
+    ('iso-8859-1', 'application/rss+xml'),
+    ('shift_jis', 'text/xml'),
+    ('utf-8', 'application/xml; charset=utf-8')
+]
+
+def benchmark_encoding(args):
+    """Compare decoding feeds like requests' Response.text against parsing raw bytes"""
+    scraper = RSSFeedScraper()
+    by_source = defaultdict(list)
+    for article in load_stored_articles():
+        by_source[article['source']].append(article)
+    if not by_source:
+        print_flush("No feeds to benchmark: run the scraper to create data/articles_*.json")
+        return
+    
+    feeds = []
+    for source, articles in by_source.items():
+        xml = build_feed(source, articles, 'rss')
+        for encoding, content_type in SERVED_ENCODINGS:
+            # Characters the encoding lacks become character references, as feed generators do
+            body = xml.replace('encoding="UTF-8"', f'encoding="{encoding}"').encode(encoding, 'xmlcharrefreplace')
+            titles = [article['title'] for article in articles]
+            feeds.append((source, body, CaseInsensitiveDict({'Content-Type': content_type}), titles))
+
+    def response_text_path():
+        # requests' Response.text: charset from headers, else detection over the whole body
+        results = []
+        for source, body, headers, _ in feeds:
+            encoding = get_encoding_from_headers(headers) or chardet.detect(body)['encoding'] or 'utf-8'
+            results.append(scraper._parse_feed_content(str(body, encoding, errors='replace'), source))
+        return results
+
+    def raw_bytes_path():
+        results = []
+        for source, body, headers, _ in feeds:
+            charset = get_encoding_from_headers(headers) if 'charset' in headers['Content-Type'] else None
+            encoding = choose_encoding(body, http_charset=charset)
+            results.append(scraper._parse_feed_content(body, source, encoding=encoding))
+        return results
+
+    def garbled(results) -> int:
+        return sum(
+            article['title'] != title
+            for (_, _, _, titles), articles in zip(feeds, results)
+            for article, title in zip(articles, titles)
+        )
+    
+    old_garbled = garbled(response_text_path())
+    new_garbled = garbled(raw_bytes_path())
+    old_time = time_runs(response_text_path, args.repeat)
+    new_time = time_runs(raw_bytes_path, args.repeat)
+    total_titles = sum(len(titles) for _, _, _, titles in feeds)
+    
+    print_flush(f"Feeds: {len(feeds)}, titles: {total_titles}")
+    print_flush(f"Response.text: {old_time:.3f}s, {old_garbled} garbled titles")
+    print_flush(f"Raw bytes:     {new_time:.3f}s, {new_garbled} garbled titles")
+    print_flush(f"Speedup: {old_time / new_time:.1f}x")
+
+# Sizes in KB of the full-article HTML put in content:encoded by the summaries benchmark
+ARTICLE_SIZES = [1, 10, 100, 1000]
+
+def build_wordpress_item(size_kb: int) -> FeedItem:
+    """Build an RSS item carrying a full HTML article of about size_kb in content:encoded, as WordPress feeds do"""
+    paragraph = (
+        "<p>The <strong>committee</strong> met on Tuesday to discuss the <a href=\"/budget\">budget</a>,\n"
+        "  and agreed to publish its findings next month.</p>\n"
+    )
+    html = paragraph * max(1, size_kb * 1024 // len(paragraph))
+    items = parse_feed_items(
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><item>'
+        f'<title>Article</title><content:encoded><![CDATA[{html}]]></content:encoded></item></channel></rss>'
+    )
+    return items[0]
+
+def benchmark_summaries(args):
+    """Compare full-text summary cleanup against bounded extraction as articles grow"""
+
+    def full_path(element) -> str:
+        # get_text() and two regex passes over the whole article, then truncation
+        text = re.sub(r'<[^>]+>', '', element.get_text())
+        return re.sub(r'\s+', ' ', text).strip()[:SUMMARY_MAX_LENGTH]
+
+    def bounded_path(element) -> str:
+        text, _ = extract_text(element, SUMMARY_MAX_LENGTH)
+        return text[:SUMMARY_MAX_LENGTH]
+    
+    print_flush(f"{'Article':>10} {'Full text':>12} {'Bounded':>12} {'Speedup':>8}")
+    for size_kb in ARTICLE_SIZES:
+        element = build_wordpress_item(size_kb).find('content:encoded')
+        if full_path(element) != bounded_path(element):
+            print_flush(f"Summaries differ for a {size_kb} KB article")
+        runs = max(1, 1000 // size_kb)
+        full_time = time_runs(lambda: [full_path(element) for _ in range(runs)], args.repeat) / runs
+        bounded_time = time_runs(lambda: [bounded_path(element) for _ in range(runs)], args.repeat) / runs
+        print_flush(
+            f"{size_kb:>7} KB {full_time * 1e6:>9.1f} us {bounded_time * 1e6:>9.1f} us "
+            f"{full_time / bounded_time:>7.1f}x"
+        )
+
+def build_backfill(count: int) -> List[Dict]:
+    """
+    Build count synthetic articles, one in ten repeating the URL of an earlier one
+    
+    Articles carry a published_at datetime, as the scrapers' articles do.
+    """
+    articles = []
+    for i in range(count):
+        number = i - 1 if i % 10 == 9 else i
+        published_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=number)
+        articles.append({
+            'title': f"Backfilled article {number}",
+            'publication_date': format_publication_date(published_at),
+            'published_at': published_at,
+            'source': f"Source {number % 50}",
+            'country': ('US', 'UK', 'JP', 'IN')[number % 4],
+            'summary': "Summary of a backfilled article. " * 10,
+            'url': f"https://example.com/articles/{number}",
+            'language': ('en', 'en', 'ja', 'hi')[number % 4]
+        })
+    return articles
+
+def benchmark_inserts(args):
+    """Compare inserting articles one commit per row against batched transactions, in rows per second"""
+    articles = build_backfill(args.articles)
+    with tempfile.TemporaryDirectory() as directory:
+        # Committing every row costs one sync per article, so it is only timed on a slice
+        row_articles = articles[:args.row_articles]
+        with Database(os.path.join(directory, 'row.db')) as db:
+            start = time.perf_counter()
+            row_inserted = sum(1 for article in row_articles if db.insert_article(article))
+            row_time = time.perf_counter() - start
+        
+        with Database(os.path.join(directory, 'batch.db')) as db:
+            start = time.perf_counter()
+            counts = db.insert_articles(articles)
+            batch_time = time.perf_counter() - start
+    
+    row_rate = len(row_articles) / row_time
+    batch_rate = len(articles) / batch_time
+    print_flush(f"Row at a time: {len(row_articles)} articles, {row_inserted} inserted, "
+                f"{row_time:.2f}s ({row_rate:,.0f} rows/s)")
+    print_flush(f"Batched:       {len(articles)} articles, {counts['inserted']} inserted, "
+                f"{counts['duplicates']} duplicates, {batch_time:.2f}s ({batch_rate:,.0f} rows/s)")
+    print_flush(f"Speedup: {batch_rate / row_rate:.1f}x")
+
+# Filters of the /api/news query shapes checked by the queries benchmark
+ARTICLE_FILTERS = [
+    {},
+    {'country': 'JP'},
+    {'source': 'Source 7'},
+    {'language': 'hi'},
+    {'country': 'UK', 'source': 'Source 9'},
+    {'country': 'US', 'language': 'en'},
+    {'source': 'Source 3', 'language': 'hi'},
+    {'country': 'IN', 'source': 'Source 3', 'language': 'hi'},
+    {'q': 'article 4217'},
+    {'q': '4217', 'language': 'en'},
+    {'q': 'backfilled article', 'country': 'JP'}
+]
+
+def benchmark_queries(args):
+    """
+    Time the API's queries on a backfilled database and check each one is answered from an index
+    
+    A query plan that scans the news table or sorts in a temporary b-tree fails the
+    check, and the benchmark exits with status 1; searches score every match, so
+    only their table scans count. Paging through all articles with cursors is then
+    timed page by page.
+    """
+    queries = []
+    for filters in ARTICLE_FILTERS:
+        name = "/api/news" + ("?" + "&".join(filters) if filters else "")
+        queries.append((name, *Database.articles_query(limit=100, **filters), 'q' in filters))
+    queries.append(("/api/news?cursor", *Database.articles_query(limit=100, after=("2024-02-05T00:00:00+00:00", 50000)), False))
+    for name, query in Database.STATS_QUERIES.items():
+        queries.append((f"/api/news/stats {name}", query, [], False))
+    
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        with Database(os.path.join(directory, 'news.db')) as db:
+            db.insert_articles(build_backfill(args.articles))
+            
+            for name, query, params, ranked in queries:
+                db.cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+                plan = [row['detail'] for row in db.cursor.fetchall()]
+                full_scan = any(
+                    detail == 'SCAN news' or ('TEMP B-TREE' in detail and not ranked) for detail in plan
+                )
+                failures += full_scan
+                elapsed = time_runs(lambda: db.cursor.execute(query, params).fetchall(), args.repeat)
+                print_flush(f"{'FAIL' if full_scan else 'ok':<4} {name:<48} {elapsed * 1000:>8.2f} ms  {'; '.join(plan)}")
+            
+            page_times = []
+            cursor = None
+            while True:
+                start = time.perf_counter()
+                _, cursor = db.get_articles_page(limit=100, cursor=cursor)
+                page_times.append(time.perf_counter() - start)
+                if cursor is None:
+                    break
+    
+    print_flush(
+        f"Paging /api/news by 100: {len(page_times)} pages, first {page_times[0] * 1000:.2f} ms, "
+        f"mean {sum(page_times) / len(page_times) * 1000:.2f} ms, slowest {max(page_times) * 1000:.2f} ms"
+    )
+    print_flush(f"{len(queries) - failures}/{len(queries)} queries answered from an index")
+    if failures:
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper hot paths")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    parser_bench = subparsers.add_parser('parser', help="Feed parsing: lxml fast path and feed profiles vs BeautifulSoup")
+    parser_bench.add_argument('feeds', nargs='*', help="Feed XML files (default: rebuilt from data/ exports)")
+    parser_bench.add_argument('--repeat', type=int, default=3, help="Runs per parser; the best is reported")
+    parser_bench.set_defaults(func=benchmark_parser)
+    
+    dates_bench = subparsers.add_parser('dates', help="Publication dates: DateNormalizer vs dateutil")
+    dates_bench.add_argument('--repeat', type=int, default=3, help="Runs per implementation; the best is reported")
+    dates_bench.set_defaults(func=benchmark_dates)
+    
+    encoding_bench = subparsers.add_parser('encoding', help="Feed decoding: Response.text vs raw bytes")
+    encoding_bench.add_argument('--repeat', type=int, default=3, help="Runs per implementation; the best is reported")
+    encoding_bench.set_defaults(func=benchmark_encoding)
+    
+    summaries_bench = subparsers.add_parser('summaries', help="Summary extraction: full text vs bounded")
+    summaries_bench.add_argument('--repeat', type=int, default=3, help="Runs per implementation; the best is reported")
+    summaries_bench.set_defaults(func=benchmark_summaries)
+    
+    inserts_bench = subparsers.add_parser('inserts', help="Article inserts: commit per row vs batched transactions")
+    inserts_bench.add_argument('--articles', type=int, default=100000, help="Articles inserted in batches")
+    inserts_bench.add_argument('--row-articles', type=int, default=5000, help="Articles inserted one commit at a time")
+    inserts_bench.set_defaults(func=benchmark_inserts)
+    
+    queries_bench = subparsers.add_parser('queries', help="API queries: timings and index use of their query plans")
+    queries_bench.add_argument('--articles', type=int, default=100000, help="Articles in the benchmark database")
+    queries_bench.add_argument('--repeat', type=int, default=3, help="Runs per query; the best is reported")
+    queries_bench.set_defaults(func=benchmark_queries)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
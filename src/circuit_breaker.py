@@ -0,0 +1,109 @@
+"""
+Circuit breaker that quarantines feeds which keep failing
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_BASE_BACKOFF, CIRCUIT_MAX_BACKOFF
+from database import Database
+
+class CircuitBreaker:
+    """
+    Per-feed circuit breaker persisted in the feed_health table
+    
+    A feed starts closed. After CIRCUIT_FAILURE_THRESHOLD consecutive failed runs it
+    opens and is skipped until its retry time, which doubles with every further
+    failure up to CIRCUIT_MAX_BACKOFF. Once the retry time passes the feed is
+    half-open: a single probe either closes the circuit again or re-opens it.
+    """
+
+    def __init__(self):
+        self.health = {}
+        self.updated = set()
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Load the stored state of every feed"""
+        with Database() as db:
+            self.health = db.get_feed_health()
+        self.updated = set()
+
+    def save(self):
+        """Persist the state of feeds that changed since load()"""
+        if not self.updated:
+            return
+        with Database() as db:
+            db.save_feed_health([self.health[url] for url in self.updated])
+        self.updated = set()
+
+    def _entry(self, url: str) -> Dict:
+        """Get (or create) the health entry of a feed"""
+        if url not in self.health:
+            self.health[url] = {
+                'feed_url': url,
+                'state': 'closed',
+                'failures': 0,
+                'retry_at': None,
+                'last_error': None
+            }
+        return self.health[url]
+
+    def allow(self, url: str) -> bool:
+        """
+        Check whether a feed may be fetched, moving open feeds past their retry time to half-open
+        """
+        with self.lock:
+            entry = self._entry(url)
+            if entry['state'] != 'open':
+                return True
+            if entry['retry_at'] and entry['retry_at'] > datetime.now().isoformat():
+                return False
+            entry['state'] = 'half_open'
+            self.updated.add(url)
+            return True
+
+    def is_half_open(self, url: str) -> bool:
+        """Check whether the next fetch of a feed is a recovery probe"""
+        with self.lock:
+            return self._entry(url)['state'] == 'half_open'
+
+    def record_success(self, url: str):
+        """Close the circuit of a feed after a successful fetch"""
+        with self.lock:
+            entry = self._entry(url)
+            if entry['state'] == 'closed' and entry['failures'] == 0:
+                return
+            entry.update({'state': 'closed', 'failures': 0, 'retry_at': None, 'last_error': None})
+            self.updated.add(url)
+
+    def record_failure(self, url: str, error: str):
+        """
+        Count a failed run of a feed, opening the circuit with exponential backoff
+        once the threshold is reached or a half-open probe fails
+        """
+        with self.lock:
+            entry = self._entry(url)
+            entry['failures'] += 1
+            entry['last_error'] = error
+            
+            if entry['state'] == 'half_open' or entry['failures'] >= CIRCUIT_FAILURE_THRESHOLD:
+                exponent = max(0, entry['failures'] - CIRCUIT_FAILURE_THRESHOLD)
+                backoff = min(CIRCUIT_BASE_BACKOFF * (2 ** exponent), CIRCUIT_MAX_BACKOFF)
+                entry['state'] = 'open'
+                entry['retry_at'] = (datetime.now() + timedelta(minutes=backoff)).isoformat()
+            
+            self.updated.add(url)
+
+    def quarantined(self) -> List[Dict]:
+        """
+        Get the feeds that are currently skipped, soonest retry first
+        """
+        now = datetime.now().isoformat()
+        with self.lock:
+            entries = [
+                dict(entry) for entry in self.health.values()
+                if entry['state'] == 'open' and entry['retry_at'] and entry['retry_at'] > now
+            ]
+        return sorted(entries, key=lambda entry: entry['retry_at'])
@@ -2,11 +2,37 @@
 Configuration file for the RSS feed scraper
 """
 
+import os
+
 # Database configuration
 DATABASE_PATH = "data/news.db"
+INSERT_BATCH_SIZE = 1000  # Articles inserted per transaction
+DATABASE_PRAGMAS = {  # Applied to every connection; the database itself is switched to WAL once
+    "synchronous": "NORMAL",        # WAL stays consistent on power loss, only the last commits may be lost
+    "busy_timeout": 5000,           # Milliseconds a connection waits for a lock before raising "database is locked"
+    "cache_size": -16000,           # Page cache per connection, in KiB when negative
+    "mmap_size": 256 * 1024 * 1024  # Bytes of the database file read through memory mapping
+}
+DATABASE_READ_POOL_SIZE = 8  # Idle read-only connections kept for reuse by the API
+
+# Full-text search configuration
+SEARCH_HIGHLIGHT = ("<mark>", "</mark>")  # Markup around matches in highlighted titles and snippets
+SEARCH_SNIPPET_TOKENS = 32  # Trigrams (roughly characters) of summary text in a search snippet
+
+# API configuration
+API_PAGE_SIZE = 100      # Articles per /api/news page when no limit is given
+API_MAX_PAGE_SIZE = 500  # Largest limit a /api/news page may ask for
 
 # Scheduling configuration (in hours)
-UPDATE_INTERVAL = 1
+UPDATE_INTERVAL = 1  # Initial poll interval for feeds without a learned cadence
+
+# Adaptive polling configuration (in minutes)
+MIN_POLL_INTERVAL = 5         # Busiest feeds are never polled more often than this
+MAX_POLL_INTERVAL = 12 * 60   # Quietest feeds are still polled at least this often
+POLL_GAP_FACTOR = 0.5         # Poll interval as a fraction of the average gap between items
+POLL_BACKOFF_FACTOR = 1.5     # Interval growth when a poll finds nothing new
+POLL_SMOOTHING = 0.5          # Weight of the newest estimate against the previous interval
+POLL_JITTER = 0.1             # Random +/- fraction applied to every interval
 
 # RSS Feed sources
 RSS_FEEDS = {
@@ -537,8 +563,68 @@ HEADERS = {
 }
 
 # Rate limiting configuration
-REQUEST_DELAY = 1  # Delay between requests in seconds
+REQUEST_DELAY = 1  # Base delay in seconds before retrying a failed request
 MAX_RETRIES = 3    # Maximum number of retry attempts for failed requests
+RATE_LIMIT_RATE = 1.0  # Requests per second allowed against a single host
+RATE_LIMIT_BURST = 2   # Requests a host may receive back-to-back before throttling
+RATE_LIMIT_OVERRIDES = {  # Per-host overrides of the rate and burst
+    "web.archive.org": {"rate": 1.0, "burst": 1}
+}
+
+# Circuit breaker configuration for feeds that keep failing
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failed runs before a feed is quarantined
+CIRCUIT_BASE_BACKOFF = 30      # Minutes a feed is skipped after it is first quarantined
+CIRCUIT_MAX_BACKOFF = 24 * 60  # Upper bound in minutes for the exponential backoff
+
+# Concurrency configuration
+MAX_CONCURRENT_FEEDS = 16    # Feeds fetched at the same time (1 = sequential)
+MAX_CONCURRENT_PER_HOST = 2  # Simultaneous requests allowed against a single host
+HISTORICAL_MAX_CONCURRENCY = 4  # Historical requests in flight at once across all sources
+HISTORICAL_SOURCE_WORKERS = 8   # Sources whose historical data is collected at the same time
+
+# Scrape pipeline configuration: fetch threads -> parse/enrich processes -> one database writer
+PARSE_WORKERS = os.cpu_count() or 1  # Processes parsing buffered feeds without STREAM_PARSING (0 = in the fetch threads)
+PIPELINE_QUEUE_SIZE = 32             # Feeds buffered between two stages before the upstream stage waits
+
+# Incremental ingestion configuration
+WATERMARK_RECENT_IDS = 500  # GUIDs/URLs remembered per feed to recognize items already ingested
+
+# Language identification configuration
+LANGUAGE_CACHE_SIZE = 100000  # Texts whose langdetect result is memoized
+LANGDETECT_SEED = 0           # Makes langdetect return the same language for the same text
+
+# Article extraction configuration
+SUMMARY_MAX_LENGTH = 500  # Longer summaries are cut to fit, ending in "..."
+
+# Feed download configuration
+STREAM_PARSING = True               # Parse feeds incrementally in the fetch threads while they download
+STREAM_CHUNK_SIZE = 64 * 1024       # Bytes read from the network per chunk
+MAX_FEED_BYTES = 10 * 1024 * 1024   # Feeds larger than this are truncated
+
+# Wayback Machine cache configuration
+WAYBACK_CACHE_DIR = "data/wayback_cache"
+WAYBACK_CACHE_MAX_MB = 512  # Least recently used entries are evicted above this size
+WAYBACK_CDX_TTL = 24        # Hours before a cached CDX snapshot listing is refreshed
+
+# Raw payload archive configuration
+ARCHIVE_PAYLOADS = False                      # Keep every fetched feed body for offline replay
+PAYLOAD_ARCHIVE_DIR = "data/payload_archive"  # Compressed bodies, stored once per content, and their index
+
+# HTTP connection pooling configuration
+HTTP_POOL_CONNECTIONS = 100  # Number of per-host connection pools kept alive
+HTTP_POOL_MAXSIZE = MAX_CONCURRENT_PER_HOST  # Keep-alive connections per host
+HTTP_POOL_MAXSIZE_BY_HOST = {  # Per-host overrides of HTTP_POOL_MAXSIZE
+    "web.archive.org": HISTORICAL_MAX_CONCURRENCY
+}
+CONNECT_TIMEOUT = 10  # Seconds to establish a connection
+READ_TIMEOUT = 30     # Seconds to wait for data between bytes received
+
+# Run deadline configuration
+RUN_TIME_BUDGET = 45 * 60  # Seconds a scrape run may take (None = unlimited)
+RUN_CANCEL_MARGIN = 60     # Feeds not yet started are cancelled once less budget than this is left
+FEED_DEADLINE = 90         # Seconds a feed may take from connecting to its last byte, retries included
+FIRST_BYTE_TIMEOUT = 15    # Seconds a feed server may take to start responding, and between reads
+HEDGE_AFTER = None         # Seconds without a response before a second, hedged request is sent (None = never)
 
 # Database table schema
 TABLE_SCHEMA = """
@@ -553,4 +639,142 @@ CREATE TABLE IF NOT EXISTS news (
     language TEXT,
     created_at TEXT DEFAULT (datetime('now'))
 )
-""" 
\ No newline at end of file
+"""
+
+# Indexes matching the article queries: filters on country, source or language ordered by
+# publication_date, per-country and per-source counts (covered by the first two) and the date range
+NEWS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_news_country_date ON news (country, publication_date)",
+    "CREATE INDEX IF NOT EXISTS idx_news_source_date ON news (source, publication_date)",
+    "CREATE INDEX IF NOT EXISTS idx_news_language_date ON news (language, publication_date)",
+    "CREATE INDEX IF NOT EXISTS idx_news_date ON news (publication_date)"
+]
+
+# Full-text index over article titles and summaries, kept in sync with the news table by triggers.
+# The trigram tokenizer needs no word boundaries, so it also indexes Japanese text; search terms
+# need at least three characters to use it.
+NEWS_FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+        title, summary, content='news', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news BEGIN
+        INSERT INTO news_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news BEGIN
+        INSERT INTO news_fts (news_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, summary ON news BEGIN
+        INSERT INTO news_fts (news_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+        INSERT INTO news_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+    END
+    """,
+    # Index the articles stored before the table existed
+    "INSERT INTO news_fts (news_fts) VALUES ('rebuild')"
+]
+
+# Per-feed fetch state used for conditional GET requests
+FEED_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_state (
+    feed_url TEXT PRIMARY KEY,
+    etag TEXT,                 -- ETag validator from the last successful fetch
+    last_modified TEXT,        -- Last-Modified validator from the last successful fetch
+    body_hash TEXT,            -- SHA-256 of the last downloaded body
+    last_success TEXT          -- ISO timestamp of the last successful fetch
+)
+"""
+
+# High-water mark of every feed, so items ingested before are not parsed again
+FEED_WATERMARK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_watermark (
+    feed_url TEXT PRIMARY KEY,
+    last_published TEXT,       -- ISO timestamp (UTC) of the newest item ingested
+    recent_ids TEXT NOT NULL   -- JSON list of recently ingested GUIDs/URLs, newest first
+)
+"""
+
+# Learned item layout of every feed, so extraction goes straight to the fields it uses
+FEED_PROFILE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_profile (
+    feed_url TEXT PRIMARY KEY,
+    format TEXT NOT NULL,         -- rss, atom, rdf or unknown
+    date_field TEXT NOT NULL,     -- Element holding the publication date
+    summary_field TEXT NOT NULL,  -- Element holding the summary
+    link_style TEXT NOT NULL,     -- href (attribute) or text (element content)
+    html_summary INTEGER NOT NULL -- 1 when summaries contain HTML markup
+)
+"""
+
+# Feeds the last run cut off at its deadline, fetched first by the next run
+FEED_CUTOFF_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_cutoff (
+    feed_url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,      -- timed_out (deadline hit while fetching) or cancelled (never started)
+    cut_at TEXT NOT NULL       -- ISO timestamp of the run that cut the feed off
+)
+"""
+
+# Learned polling cadence of every feed for the scheduler mode
+FEED_SCHEDULE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_schedule (
+    feed_url TEXT PRIMARY KEY,
+    poll_interval REAL NOT NULL,  -- Learned interval between polls in seconds
+    next_poll TEXT NOT NULL       -- ISO timestamp of the next scheduled poll
+)
+"""
+
+# Circuit breaker state of every feed
+FEED_HEALTH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_health (
+    feed_url TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'closed',  -- closed, open or half_open
+    failures INTEGER NOT NULL DEFAULT 0,   -- Consecutive failed runs
+    retry_at TEXT,                         -- ISO timestamp when an open feed may be probed again
+    last_error TEXT
+)
+"""
+
+# Index of the raw payload archive, kept next to the payloads in PAYLOAD_ARCHIVE_DIR
+PAYLOAD_ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,              -- live (feed fetch) or historical (Wayback snapshot)
+    feed_url TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,        -- ISO timestamp (UTC) of the fetch
+    snapshot_date TEXT,              -- Date of a historical snapshot
+    snapshot_url TEXT UNIQUE,        -- Wayback URL of a historical snapshot
+    body_hash TEXT NOT NULL,         -- SHA-256 of the body, naming its compressed file
+    encoding TEXT,                   -- Encoding the body was decoded with, if known
+    size INTEGER NOT NULL,           -- Uncompressed body size in bytes
+    complete INTEGER NOT NULL        -- 0 when the download was cut short
+);
+CREATE INDEX IF NOT EXISTS idx_payloads_feed_time ON payloads (feed_url, fetched_at);
+"""
+
+# Historical collection runs and their checkpoints, used to resume interrupted runs
+HISTORICAL_RUNS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS historical_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT               -- NULL while the run is incomplete
+)
+"""
+
+HISTORICAL_CHECKPOINTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS historical_checkpoints (
+    run_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,            -- source, snapshot or archive
+    item TEXT NOT NULL,            -- Feed URL for source/archive, Wayback URL for snapshot
+    articles INTEGER NOT NULL DEFAULT 0,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, kind, item)
+)
+"""
@@ -4,27 +4,120 @@ Database operations module for the RSS feed scraper
 
 import sqlite3
 import os
+import json
+import base64
+import queue
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dateutil.parser import parse as parse_date
 from dateutil.tz import tzutc
 
-from config import DATABASE_PATH, TABLE_SCHEMA
+from config import (
+    DATABASE_PATH, INSERT_BATCH_SIZE, DATABASE_PRAGMAS, DATABASE_READ_POOL_SIZE,
+    SEARCH_HIGHLIGHT, SEARCH_SNIPPET_TOKENS
+)
+from migrations import migrate
 
-class Database:
-    def __init__(self):
+# Database files whose schema this process has set up, keyed by path and inode
+_prepared = set()
+_prepare_lock = threading.Lock()
+# Idle read-only connections, keyed by database path
+_read_pools = {}
+_read_pools_lock = threading.Lock()
+
+def _configure(conn: sqlite3.Connection):
+    """Apply the row factory and DATABASE_PRAGMAS to a new connection"""
+    conn.row_factory = sqlite3.Row
+    for name, value in DATABASE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+def _file_key(path: str) -> Tuple[str, int]:
+    """Identify a database file, so one replaced on disk is set up again"""
+    path = os.path.abspath(path)
+    return path, os.stat(path).st_ino
+
+def _prepare(path: str):
+    """
+    Create or upgrade the database schema and switch it to WAL, once per file and process
+    
+    In WAL mode readers don't block the writer and the writer doesn't block readers,
+    so the API keeps answering while a scrape commits.
+    """
+    with _prepare_lock:
+        if os.path.exists(path) and _file_key(path) in _prepared:
+            return
+        
         # Create data directory if it doesn't exist
-        os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path)
+        try:
+            _configure(conn)
+            conn.execute("PRAGMA journal_mode = WAL")
+            migrate(conn)
+        finally:
+            conn.close()
+        _prepared.add(_file_key(path))
+
+def _read_pool(path: str) -> queue.LifoQueue:
+    """Get the pool of idle read-only connections to a database file"""
+    with _read_pools_lock:
+        return _read_pools.setdefault(_file_key(path), queue.LifoQueue())
+
+def _search_terms(q: Optional[str]) -> Tuple[List[str], List[str]]:
+    """Split search terms into those the trigram index can look up and those too short for it"""
+    terms = q.split() if q else []
+    return [term for term in terms if len(term) >= 3], [term for term in terms if len(term) < 3]
+
+def _encode_cursor(kind: str, key, article_id: int) -> str:
+    """Make the opaque cursor of the page after an article"""
+    token = json.dumps([kind, key, article_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor: str, kind: str) -> Tuple:
+    """
+    Get the (key, id) a cursor continues after
+    
+    Raises:
+        ValueError: When the cursor is malformed or of another kind
+    """
+    try:
+        token = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_kind, key, article_id = json.loads(token)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    key_type = float if kind == 'rank' else str
+    if cursor_kind != kind or not isinstance(key, key_type) or not isinstance(article_id, int):
+        raise ValueError("Invalid cursor")
+    return key, article_id
+
+class Database:
+    def __init__(self, path: str = DATABASE_PATH, read_only: bool = False):
+        """
+        Open a connection to the database, creating it and its tables on first use
+        
+        Args:
+            path (str): Database file
+            read_only (bool): Borrow a pooled read-only connection, for serving reads
+                alongside a writing scraper; it goes back to the pool on close
+        """
+        _prepare(path)
+        self.pool = _read_pool(path) if read_only else None
         
-        self.conn = sqlite3.connect(DATABASE_PATH)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = None
+        if self.pool is not None:
+            try:
+                self.conn = self.pool.get_nowait()
+            except queue.Empty:
+                pass
+        if self.conn is None:
+            if read_only:
+                uri = f"file:{os.path.abspath(path)}?mode=ro"
+                self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            else:
+                self.conn = sqlite3.connect(path)
+            _configure(self.conn)
         self.cursor = self.conn.cursor()
-        self._create_table()
-
-    def _create_table(self):
-        """Create the news table if it doesn't exist"""
-        self.cursor.execute(TABLE_SCHEMA)
-        self.conn.commit()
 
     def insert_article(self, article: Dict) -> bool:
         """
@@ -32,39 +125,97 @@ class Database:
         
         Args:
             article (Dict): Article data containing title, date, source, etc.
-            
+        
         Returns:
             bool: True if insertion was successful, False if article already exists
         """
-        try:
-            # Parse the date string to datetime
+        return self.insert_articles([article])['inserted'] == 1
+
+    def insert_articles(self, articles: List[Dict], batch_size: int = INSERT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Insert news articles in batches, each batch a single transaction
+        
+        Args:
+            articles (List[Dict]): Articles containing title, date, source, etc.
+            batch_size (int): Articles inserted and committed together
+        
+        Returns:
+            Dict[str, int]: Numbers of articles inserted, skipped as duplicates (of a stored
+                article or an earlier one in the list) and failed for missing or invalid fields
+        """
+        counts = {'inserted': 0, 'duplicates': 0, 'failed': 0}
+        for start in range(0, len(articles), batch_size):
+            try:
+                batch_counts = self._insert_article_rows(articles[start:start + batch_size])
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            for key, count in batch_counts.items():
+                counts[key] += count
+        return counts
+
+    def _article_row(self, article: Dict) -> Tuple:
+        """
+        Get the column values of an article
+        
+        Raises:
+            ValueError: When a required field is missing or the date can't be parsed
+        """
+        # Scraped articles carry an aware datetime; parse the string only for other sources
+        pub_date = article.get('published_at')
+        if pub_date is None:
             pub_date = parse_date(article['publication_date'])
             if pub_date.tzinfo is None:
                 pub_date = pub_date.replace(tzinfo=tzutc())
-            
-            self.cursor.execute("""
-                INSERT INTO news (title, publication_date, source, country, summary, url, language)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                article['title'],
-                pub_date.isoformat(),
-                article['source'],
-                article['country'],
-                article.get('summary', ''),
-                article['url'],
-                article.get('language', 'en')
-            ))
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            # Article already exists (due to UNIQUE constraint on url)
-            return False
+        
+        row = (
+            article['title'],
+            pub_date.isoformat(),
+            article['source'],
+            article['country'],
+            article.get('summary', ''),
+            article['url'],
+            article.get('language', 'en')
+        )
+        if None in (row[0], row[2], row[3], row[5]):
+            raise ValueError("missing title, source, country or url")
+        return row
+
+    def _insert_article_rows(self, articles: List[Dict]) -> Dict[str, int]:
+        """
+        Insert news articles with one statement, without committing
+        
+        Articles whose URL is already stored are skipped by the ON CONFLICT clause
+        instead of raising, and the number inserted is read from the statement's
+        change count.
+        
+        Returns:
+            Dict[str, int]: Numbers of articles inserted, skipped as duplicates and failed
+        """
+        rows = []
+        failed = 0
+        for article in articles:
+            try:
+                rows.append(self._article_row(article))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                failed += 1
+        
+        self.cursor.executemany("""
+            INSERT INTO news (title, publication_date, source, country, summary, url, language)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO NOTHING
+        """, rows)
+        # Row count of sqlite3_changes(), which leaves out rows written by triggers
+        inserted = self.cursor.rowcount
+        return {'inserted': inserted, 'duplicates': len(rows) - inserted, 'failed': failed}
 
     def get_articles(self, 
                     country: Optional[str] = None, 
                     source: Optional[str] = None,
                     language: Optional[str] = None,
-                    limit: int = 100) -> List[Dict]:
+                    limit: int = 100,
+                    q: Optional[str] = None) -> List[Dict]:
         """
         Retrieve articles from the database with optional filters
         
@@ -73,13 +224,105 @@ class Database:
             source (str, optional): Filter by news source
             language (str, optional): Filter by language
             limit (int): Maximum number of articles to return
-            
+            q (str, optional): Search terms the title or summary must all contain; results
+                are ranked by relevance and carry title_highlight and snippet fields
+        
         Returns:
             List[Dict]: List of articles matching the criteria
         """
-        query = "SELECT * FROM news WHERE 1=1"
-        params = []
+        query, params = self.articles_query(country, source, language, limit, q)
+        self.cursor.execute(query, params)
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def get_articles_page(self,
+                          country: Optional[str] = None,
+                          source: Optional[str] = None,
+                          language: Optional[str] = None,
+                          limit: int = 100,
+                          q: Optional[str] = None,
+                          cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Retrieve a page of articles, continuing after the page a cursor was returned with
+        
+        Pages are read with keyset pagination: each one starts from an index seek past
+        the last article of the previous page, so a page deep into the archive costs as
+        much as the first one. Searches page through their ranking the same way, but
+        articles stored in between change the relevance scores.
+        
+        Args:
+            country, source, language, limit, q: As for get_articles
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            Tuple[List[Dict], Optional[str]]: The articles and the cursor of the next page,
+                None on the last page
+        
+        Raises:
+            ValueError: When the cursor is malformed or was returned for a search when
+                this request isn't one, or the other way around
+        """
+        ranked = bool(_search_terms(q)[0])
+        kind = 'rank' if ranked else 'date'
+        after = _decode_cursor(cursor, kind) if cursor else None
+        
+        query, params = self.articles_query(country, source, language, limit + 1, q, after)
+        self.cursor.execute(query, params)
+        articles = [dict(row) for row in self.cursor.fetchmany(limit + 1)]
+        
+        if len(articles) <= limit:
+            return articles, None
+        articles = articles[:limit]
+        last = articles[-1]
+        return articles, _encode_cursor(kind, last['rank'] if ranked else last['publication_date'], last['id'])
 
+    @staticmethod
+    def articles_query(country: Optional[str] = None,
+                       source: Optional[str] = None,
+                       language: Optional[str] = None,
+                       limit: int = 100,
+                       q: Optional[str] = None,
+                       after: Optional[Tuple] = None) -> Tuple[str, List]:
+        """
+        Build the query get_articles runs, for it and for query plan checks
+        
+        Search terms of three or more characters are looked up in the trigram
+        full-text index and ranked with bm25. Shorter terms, such as two-character
+        Japanese words, are too short for trigrams and are matched with LIKE instead;
+        when all terms are that short, results are ordered by date without snippets.
+        
+        Args:
+            after (Tuple, optional): (publication_date, id), or (rank, id) for searches
+                ranked by relevance, of the article the results continue after
+        
+        Returns:
+            Tuple[str, List]: SQL and its parameters
+        """
+        indexed, short = _search_terms(q)
+        
+        if indexed:
+            mark_open, mark_close = SEARCH_HIGHLIGHT
+            query = """
+                SELECT news.*, news_fts.rank AS rank,
+                    highlight(news_fts, 0, ?, ?) AS title_highlight,
+                    snippet(news_fts, 1, ?, ?, '...', ?) AS snippet
+                FROM news_fts JOIN news ON news.id = news_fts.rowid
+                WHERE news_fts MATCH ?
+            """
+            # Each term is a quoted phrase, so FTS5 operators and punctuation are taken literally
+            match = ' '.join('"' + term.replace('"', '""') + '"' for term in indexed)
+            params = [mark_open, mark_close, mark_open, mark_close, SEARCH_SNIPPET_TOKENS, match]
+        elif short:
+            query = "SELECT *, NULL AS rank, NULL AS title_highlight, NULL AS snippet FROM news WHERE 1=1"
+            params = []
+        else:
+            query = "SELECT * FROM news WHERE 1=1"
+            params = []
+        
+        for term in short:
+            pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            query += " AND (news.title LIKE ? ESCAPE '\\' OR news.summary LIKE ? ESCAPE '\\')"
+            params.extend([pattern, pattern])
+        
         if country:
             query += " AND country = ?"
             params.append(country)
@@ -87,16 +330,37 @@ class Database:
         if source:
             query += " AND source = ?"
             params.append(source)
-            
+        
         if language:
             query += " AND language = ?"
             params.append(language)
-
-        query += " ORDER BY publication_date DESC LIMIT ?"
+        
+        if indexed:
+            if after:
+                query += " AND (news_fts.rank, news.id) > (?, ?)"
+                params.extend(after)
+            # Ties in relevance are broken by id, so pages neither skip nor repeat articles
+            query += " ORDER BY news_fts.rank, news.id LIMIT ?"
+        else:
+            if after:
+                query += " AND (publication_date, news.id) < (?, ?)"
+                params.extend(after)
+            # The date indexes end with the rowid, so they also give the order of id
+            query += " ORDER BY publication_date DESC, news.id DESC LIMIT ?"
         params.append(limit)
-
-        self.cursor.execute(query, params)
-        return [dict(row) for row in self.cursor.fetchall()]
+        return query, params
+    
+    # Queries of get_stats, each answered from an index
+    STATS_QUERIES = {
+        'articles_by_country': "SELECT country, COUNT(*) as count FROM news GROUP BY country",
+        'articles_by_source': "SELECT source, COUNT(*) as count FROM news GROUP BY source",
+        # Separate MIN and MAX subqueries each take a single index lookup
+        'date_range': """
+            SELECT
+                (SELECT MIN(publication_date) FROM news) as oldest,
+                (SELECT MAX(publication_date) FROM news) as newest
+        """
+    }
 
     def get_stats(self) -> Dict:
         """
@@ -106,30 +370,17 @@ class Database:
             Dict: Statistics including total articles per country/source
         """
         # Get articles per country
-        self.cursor.execute("""
-            SELECT country, COUNT(*) as count 
-            FROM news 
-            GROUP BY country
-        """)
+        self.cursor.execute(self.STATS_QUERIES['articles_by_country'])
         countries = {row['country']: row['count'] for row in self.cursor.fetchall()}
-
+        
         # Get articles per source
-        self.cursor.execute("""
-            SELECT source, COUNT(*) as count 
-            FROM news 
-            GROUP BY source
-        """)
+        self.cursor.execute(self.STATS_QUERIES['articles_by_source'])
         sources = {row['source']: row['count'] for row in self.cursor.fetchall()}
-
+        
         # Get date range
-        self.cursor.execute("""
-            SELECT 
-                MIN(publication_date) as oldest,
-                MAX(publication_date) as newest
-            FROM news
-        """)
+        self.cursor.execute(self.STATS_QUERIES['date_range'])
         date_range = self.cursor.fetchone()
-
+        
         return {
             'total_articles': sum(countries.values()),
             'articles_by_country': countries,
@@ -140,8 +391,274 @@ class Database:
             }
         }
 
+    def get_feed_states(self) -> Dict[str, Dict]:
+        """
+        Get the stored fetch state of every feed
+        
+        Returns:
+            Dict[str, Dict]: Fetch state (etag, last_modified, body_hash, last_success) keyed by feed URL
+        """
+        self.cursor.execute("SELECT * FROM feed_state")
+        return {row['feed_url']: dict(row) for row in self.cursor.fetchall()}
+
+    def save_feed_states(self, states: List[Dict]):
+        """
+        Insert or update the fetch state of feeds
+        
+        Args:
+            states (List[Dict]): Fetch states, each containing feed_url, etag, last_modified,
+                body_hash and last_success
+        """
+        self.cursor.executemany("""
+            INSERT INTO feed_state (feed_url, etag, last_modified, body_hash, last_success)
+            VALUES (:feed_url, :etag, :last_modified, :body_hash, :last_success)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body_hash = excluded.body_hash,
+                last_success = excluded.last_success
+        """, states)
+        self.conn.commit()
+
+    def get_feed_watermarks(self) -> Dict[str, Dict]:
+        """
+        Get the stored high-water mark of every feed
+        
+        Returns:
+            Dict[str, Dict]: High-water mark (last_published, recent_ids as a list) keyed by feed URL
+        """
+        self.cursor.execute("SELECT * FROM feed_watermark")
+        return {
+            row['feed_url']: {
+                'feed_url': row['feed_url'],
+                'last_published': row['last_published'],
+                'recent_ids': json.loads(row['recent_ids'])
+            }
+            for row in self.cursor.fetchall()
+        }
+
+    def save_feed_watermarks(self, watermarks: List[Dict]):
+        """
+        Insert or update the high-water marks of feeds
+        
+        Args:
+            watermarks (List[Dict]): High-water marks, each containing feed_url,
+                last_published and recent_ids
+        """
+        self.cursor.executemany("""
+            INSERT INTO feed_watermark (feed_url, last_published, recent_ids)
+            VALUES (?, ?, ?)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                last_published = excluded.last_published,
+                recent_ids = excluded.recent_ids
+        """, [
+            (watermark['feed_url'], watermark['last_published'], json.dumps(watermark['recent_ids']))
+            for watermark in watermarks
+        ])
+        self.conn.commit()
+
+    def get_feed_profiles(self) -> Dict[str, Dict]:
+        """
+        Get the learned item layout of every profiled feed
+        
+        Returns:
+            Dict[str, Dict]: Profile (format, date_field, summary_field, link_style,
+                html_summary) keyed by feed URL
+        """
+        self.cursor.execute("SELECT * FROM feed_profile")
+        return {
+            row['feed_url']: {**dict(row), 'html_summary': bool(row['html_summary'])}
+            for row in self.cursor.fetchall()
+        }
+
+    def save_feed_profiles(self, profiles: List[Dict]):
+        """
+        Insert or update the learned item layout of feeds
+        
+        Args:
+            profiles (List[Dict]): Profiles, each containing feed_url, format, date_field,
+                summary_field, link_style and html_summary
+        """
+        self.cursor.executemany("""
+            INSERT INTO feed_profile (feed_url, format, date_field, summary_field, link_style, html_summary)
+            VALUES (:feed_url, :format, :date_field, :summary_field, :link_style, :html_summary)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                format = excluded.format,
+                date_field = excluded.date_field,
+                summary_field = excluded.summary_field,
+                link_style = excluded.link_style,
+                html_summary = excluded.html_summary
+        """, [{**profile, 'html_summary': int(profile['html_summary'])} for profile in profiles])
+        self.conn.commit()
+
+    def get_feed_cutoffs(self) -> Dict[str, Dict]:
+        """
+        Get the feeds the last runs cut off at their deadline
+        
+        Returns:
+            Dict[str, Dict]: Cut-off status and time keyed by feed URL
+        """
+        self.cursor.execute("SELECT * FROM feed_cutoff")
+        return {row['feed_url']: dict(row) for row in self.cursor.fetchall()}
+
+    def save_feed_cutoffs(self, cutoffs: List[Dict], completed: List[str]):
+        """
+        Record the feeds a run cut off and forget those it completed
+        
+        Args:
+            cutoffs (List[Dict]): Cut-off feeds, each containing feed_url, status and cut_at
+            completed (List[str]): URLs of feeds the run finished, cut off or not before
+        """
+        self.cursor.executemany("""
+            INSERT INTO feed_cutoff (feed_url, status, cut_at)
+            VALUES (:feed_url, :status, :cut_at)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                status = excluded.status,
+                cut_at = excluded.cut_at
+        """, cutoffs)
+        self.cursor.executemany("DELETE FROM feed_cutoff WHERE feed_url = ?", [(url,) for url in completed])
+        self.conn.commit()
+
+    def get_feed_schedules(self) -> Dict[str, Dict]:
+        """
+        Get the learned polling schedule of every feed
+        
+        Returns:
+            Dict[str, Dict]: Schedule (poll_interval, next_poll) keyed by feed URL
+        """
+        self.cursor.execute("SELECT * FROM feed_schedule")
+        return {row['feed_url']: dict(row) for row in self.cursor.fetchall()}
+
+    def save_feed_schedules(self, schedules: List[Dict]):
+        """
+        Insert or update the polling schedule of feeds
+        
+        Args:
+            schedules (List[Dict]): Schedules, each containing feed_url, poll_interval and next_poll
+        """
+        self.cursor.executemany("""
+            INSERT INTO feed_schedule (feed_url, poll_interval, next_poll)
+            VALUES (:feed_url, :poll_interval, :next_poll)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                poll_interval = excluded.poll_interval,
+                next_poll = excluded.next_poll
+        """, schedules)
+        self.conn.commit()
+
+    def get_feed_health(self) -> Dict[str, Dict]:
+        """
+        Get the circuit breaker state of every feed
+        
+        Returns:
+            Dict[str, Dict]: Health (state, failures, retry_at, last_error) keyed by feed URL
+        """
+        self.cursor.execute("SELECT * FROM feed_health")
+        return {row['feed_url']: dict(row) for row in self.cursor.fetchall()}
+
+    def save_feed_health(self, health: List[Dict]):
+        """
+        Insert or update the circuit breaker state of feeds
+        
+        Args:
+            health (List[Dict]): Health entries, each containing feed_url, state, failures,
+                retry_at and last_error
+        """
+        self.cursor.executemany("""
+            INSERT INTO feed_health (feed_url, state, failures, retry_at, last_error)
+            VALUES (:feed_url, :state, :failures, :retry_at, :last_error)
+            ON CONFLICT(feed_url) DO UPDATE SET
+                state = excluded.state,
+                failures = excluded.failures,
+                retry_at = excluded.retry_at,
+                last_error = excluded.last_error
+        """, health)
+        self.conn.commit()
+
+    def start_historical_run(self, start_date: str, end_date: str) -> int:
+        """
+        Record the start of a historical collection run
+        
+        Returns:
+            int: ID of the new run
+        """
+        self.cursor.execute("""
+            INSERT INTO historical_runs (start_date, end_date, started_at)
+            VALUES (?, ?, ?)
+        """, (start_date, end_date, datetime.now().isoformat()))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def finish_historical_run(self, run_id: int):
+        """Mark a historical collection run as complete"""
+        self.cursor.execute(
+            "UPDATE historical_runs SET finished_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), run_id)
+        )
+        self.conn.commit()
+
+    def get_unfinished_historical_run(self) -> Optional[Dict]:
+        """
+        Get the most recent historical collection run that did not complete
+        
+        Returns:
+            Optional[Dict]: Run (id, start_date, end_date, started_at), or None
+        """
+        self.cursor.execute("""
+            SELECT * FROM historical_runs
+            WHERE finished_at IS NULL
+            ORDER BY id DESC
+            LIMIT 1
+        """)
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_historical_checkpoints(self, run_id: int) -> Dict[str, set]:
+        """
+        Get the work already completed by a historical collection run
+        
+        Returns:
+            Dict[str, set]: Completed items keyed by checkpoint kind (source, snapshot, archive)
+        """
+        self.cursor.execute(
+            "SELECT kind, item FROM historical_checkpoints WHERE run_id = ?",
+            (run_id,)
+        )
+        checkpoints = {'source': set(), 'snapshot': set(), 'archive': set()}
+        for row in self.cursor.fetchall():
+            checkpoints.setdefault(row['kind'], set()).add(row['item'])
+        return checkpoints
+
+    def save_historical_checkpoint(self, run_id: int, kind: str, item: str, articles: List[Dict]) -> int:
+        """
+        Insert the articles of a unit of historical work and record its checkpoint in one transaction
+        
+        Args:
+            run_id (int): Historical collection run
+            kind (str): Checkpoint kind (source, snapshot or archive)
+            item (str): Feed URL or Wayback URL identifying the unit of work
+            articles (List[Dict]): Articles produced by that unit of work
+        
+        Returns:
+            int: Number of new articles inserted
+        """
+        try:
+            inserted = self._insert_article_rows(articles)['inserted']
+            self.cursor.execute("""
+                INSERT OR REPLACE INTO historical_checkpoints (run_id, kind, item, articles, completed_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (run_id, kind, item, inserted, datetime.now().isoformat()))
+            self.conn.commit()
+            return inserted
+        except Exception:
+            self.conn.rollback()
+            raise
+
     def close(self):
-        """Close the database connection"""
+        """Close the database connection, or return a read-only one to its pool"""
+        self.cursor.close()
+        if self.pool is not None and self.pool.qsize() < DATABASE_READ_POOL_SIZE:
+            self.pool.put(self.conn)
+            return
         self.conn.close()
 
     def __enter__(self):
@@ -0,0 +1,171 @@
+"""
+Publication date normalization shared by the live and historical scrapers
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+from dateutil import parser as date_parser
+
+# Format used for the publication_date string of articles
+RFC822_OUTPUT_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
+_RFC822_PATTERN = re.compile(
+    r'^\s*(?:[A-Za-z]{3},?\s*)?(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{2,4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([A-Za-z]{1,5}|[+-]\d{2}:?\d{2})?\s*$'
+)
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+# Zone names allowed by RFC 822; anything else is left to dateutil
+_ZONES = {
+    'GMT': 0, 'UT': 0, 'UTC': 0, 'Z': 0,
+    'EST': -5, 'EDT': -4, 'CST': -6, 'CDT': -5, 'MST': -7, 'MDT': -6, 'PST': -8, 'PDT': -7
+}
+_ISO_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# Formats tried after dateutil gives up
+_FALLBACK_FORMATS = [
+    "%a, %d %b %Y %H:%M:%S %Z",  # RFC 2822
+    "%Y-%m-%d %H:%M:%S",         # ISO format
+    "%Y-%m-%dT%H:%M:%S",         # ISO with T
+    "%Y-%m-%d",                  # Date only
+    "%d %b %Y",                  # Simple format
+    "%B %d, %Y"                  # Month Day, Year
+]
+
+def parse_rfc822(date_str: str) -> Optional[datetime]:
+    """
+    Parse an RFC 822/2822 date such as 'Mon, 26 May 2025 18:14:49 GMT'
+    
+    Returns:
+        Optional[datetime]: Parsed date (naive when it has no zone), or None when the
+            string is not in this format
+    """
+    match = _RFC822_PATTERN.match(date_str)
+    if not match:
+        return None
+    
+    day, month_name, year, hour, minute, second, zone = match.groups()
+    month = _MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+    
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    
+    tzinfo = None
+    if zone:
+        if zone[0] in '+-':
+            digits = zone[1:].replace(':', '')
+            offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+            tzinfo = timezone(-offset if zone[0] == '-' else offset)
+        elif zone.upper() in _ZONES:
+            tzinfo = timezone(timedelta(hours=_ZONES[zone.upper()]))
+        else:
+            return None
+    
+    try:
+        return datetime(year, month, int(day), int(hour), int(minute), int(second or 0), tzinfo=tzinfo)
+    except ValueError:
+        return None
+
+def parse_iso8601(date_str: str) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 date such as '2025-05-26T18:14:49Z' or '2025-05-26T18:14:49+09:00'
+    
+    Returns:
+        Optional[datetime]: Parsed date (naive when it has no offset), or None when the
+            string is not in this format
+    """
+    date_str = date_str.strip()
+    if not _ISO_PATTERN.match(date_str):
+        return None
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        return None
+
+def parse_with_dateutil(date_str: str) -> Optional[datetime]:
+    """
+    Parse any date dateutil understands, then the fallback formats
+    """
+    try:
+        return date_parser.parse(date_str)
+    except Exception:
+        pass
+    
+    for fmt in _FALLBACK_FORMATS:
+        try:
+            return datetime.strptime(date_str.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+def to_utc(date: datetime) -> datetime:
+    """Convert a date to an aware UTC datetime, treating naive dates as UTC"""
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+def format_publication_date(date: datetime) -> str:
+    """Format an aware date as the RFC 822 publication_date string of an article"""
+    return to_utc(date).strftime(RFC822_OUTPUT_FORMAT)
+
+def without_datetime(article: Dict) -> Dict:
+    """Copy an article without its published_at datetime, for JSON and CSV export"""
+    return {key: value for key, value in article.items() if key != 'published_at'}
+
+class DateNormalizer:
+    """
+    Parses publication dates into aware UTC datetimes, remembering which format
+    each feed uses
+    
+    Feeds almost always format every item the same way, so the parser that
+    worked for a feed's previous item is tried first. RFC 822 and ISO 8601 dates
+    are handled by fast dedicated parsers; dateutil is only used for the rest.
+    """
+    
+    PARSERS: Dict[str, Callable[[str], Optional[datetime]]] = {
+        'rfc822': parse_rfc822,
+        'iso8601': parse_iso8601,
+        'dateutil': parse_with_dateutil
+    }
+
+    def __init__(self):
+        # Name of the parser that last succeeded, keyed by feed
+        self.formats = {}
+
+    def parse(self, date_str: str, feed: Optional[str] = None) -> Optional[datetime]:
+        """
+        Parse a publication date
+        
+        Args:
+            date_str (str): Date as found in the feed
+            feed (str, optional): Feed URL or source name whose format is memoized
+        
+        Returns:
+            Optional[datetime]: Aware UTC datetime (naive dates are taken as UTC),
+                or None when the date can't be parsed
+        """
+        if not date_str:
+            return None
+        
+        remembered = self.formats.get(feed)
+        if remembered:
+            date = self.PARSERS[remembered](date_str)
+            if date is not None:
+                return to_utc(date)
+        
+        for name, parser in self.PARSERS.items():
+            if name == remembered:
+                continue
+            date = parser(date_str)
+            if date is not None:
+                if feed is not None:
+                    self.formats[feed] = name
+                return to_utc(date)
+        
+        return None
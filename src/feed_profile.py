@@ -0,0 +1,80 @@
+"""
+Per-feed profiles of the elements their items keep each field in
+"""
+
+from typing import Dict, Optional
+
+class FeedProfile:
+    """
+    Item layout learned for a feed: its format, the elements holding the
+    publication date and summary, whether the link is an href attribute or the
+    element text, and whether summaries contain HTML markup
+    
+    Feeds render every item from the same template, so items of a profiled feed
+    are read straight from the profiled elements instead of probing each
+    candidate in turn. An item that doesn't fit the profile is probed in full and
+    the profile is learned again from it; a change of feed format discards it.
+    """
+
+    def __init__(self, feed_url: str, format: Optional[str] = None, date_field: Optional[str] = None,
+                 summary_field: Optional[str] = None, link_style: Optional[str] = None,
+                 html_summary: bool = False):
+        self.feed_url = feed_url
+        self.format = format
+        self.date_field = date_field
+        self.summary_field = summary_field
+        self.link_style = link_style
+        self.html_summary = html_summary
+        # Whether the profile was learned or relearned in the current run
+        self.changed = False
+
+    @classmethod
+    def from_stored(cls, feed_url: str, stored: Optional[Dict]) -> 'FeedProfile':
+        """Create a feed's profile from its database row, or an empty one"""
+        if not stored:
+            return cls(feed_url)
+        return cls(
+            feed_url, stored['format'], stored['date_field'], stored['summary_field'],
+            stored['link_style'], stored['html_summary']
+        )
+
+    @property
+    def known(self) -> bool:
+        """Whether the feed's item layout has been learned"""
+        return self.date_field is not None
+
+    def check_format(self, feed_format: str):
+        """Discard the learned layout when the feed switched to another format"""
+        if feed_format == self.format:
+            return
+        if self.known:
+            self.date_field = self.summary_field = self.link_style = None
+            self.html_summary = False
+        self.format = feed_format
+        self.changed = True
+
+    def learn(self, date_field: str, summary_field: str, link_style: str, html_summary: bool):
+        """
+        Remember the layout a fully probed item was found to use
+        
+        Args:
+            date_field (str): Element the publication date was parsed from
+            summary_field (str): Element the summary was taken from
+            link_style (str): 'href' when the link is an attribute, 'text' otherwise
+            html_summary (bool): Whether the summary contained HTML markup
+        """
+        layout = (date_field, summary_field, link_style, html_summary)
+        if layout != (self.date_field, self.summary_field, self.link_style, self.html_summary):
+            self.date_field, self.summary_field, self.link_style, self.html_summary = layout
+            self.changed = True
+
+    def to_stored(self) -> Dict:
+        """Get the profile as a database row"""
+        return {
+            'feed_url': self.feed_url,
+            'format': self.format or 'unknown',
+            'date_field': self.date_field,
+            'summary_field': self.summary_field,
+            'link_style': self.link_style,
+            'html_summary': self.html_summary
+        }
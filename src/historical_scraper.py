@@ -3,21 +3,32 @@ Historical news data scraper for collecting past year's news articles
 Uses multiple approaches: Wayback Machine, web scraping, and external APIs
 """
 
-import requests
-import time
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup
-from dateutil import parser as date_parser
 from urllib.parse import urljoin, urlparse
 import re
 from tqdm import tqdm
 import sys
+import threading
+import queue
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-from config import RSS_FEEDS, HEADERS, REQUEST_DELAY, MAX_RETRIES
+from config import (
+    RSS_FEEDS, HISTORICAL_MAX_CONCURRENCY, HISTORICAL_SOURCE_WORKERS,
+    SUMMARY_MAX_LENGTH, ARCHIVE_PAYLOADS, INSERT_BATCH_SIZE
+)
 from database import Database
+from http_session import get_session, REQUEST_TIMEOUT
+from rate_limiter import get_rate_limiter
+from wayback_cache import WaybackCache
+from payload_archive import PayloadArchive
+from feed_parser import choose_encoding, extract_text, parse_feed_items
+from date_normalizer import DateNormalizer, format_publication_date, to_utc, without_datetime
+from language_detector import LanguageDetector
 
 def print_flush(message):
     """Print message and flush immediately for real-time logging"""
@@ -28,9 +39,18 @@ class HistoricalNewsScraper:
     def __init__(self):
         self.wayback_api = "http://web.archive.org/cdx/search/cdx"
         self.newsapi_key = os.getenv('NEWSAPI_KEY')  # Users can add their API key
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-        
+        self.session = get_session()
+        self.rate_limiter = get_rate_limiter()
+        # Global budget of requests in flight across all sources
+        self.request_slots = threading.BoundedSemaphore(HISTORICAL_MAX_CONCURRENCY)
+        self.cache = WaybackCache()
+        self.date_normalizer = DateNormalizer()
+        self.language_detector = LanguageDetector()
+        # Encoding that last decoded each source's snapshots, keyed by source name
+        self.feed_encodings = {}
+        # Raw payload archive every fetched snapshot is kept in, when enabled
+        self.archive = PayloadArchive() if ARCHIVE_PAYLOADS else None
+
     def get_wayback_snapshots(self, url: str, start_date: str, end_date: str) -> List[Dict]:
         """
         Get historical snapshots of RSS feeds from Wayback Machine
@@ -48,10 +68,15 @@ class HistoricalNewsScraper:
         }
         
         try:
-            response = requests.get(self.wayback_api, params=params, timeout=30)
-            response.raise_for_status()
+            data = self.cache.get_cdx(params)
+            if data is None:
+                self.rate_limiter.wait(self.wayback_api)
+                response = self.session.get(self.wayback_api, params=params, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+                
+                data = response.json()
+                self.cache.put_cdx(params, data)
             
-            data = response.json()
             if not data:
                 return []
             
@@ -73,36 +98,56 @@ class HistoricalNewsScraper:
             
             print_flush(f"Found {len(snapshots)} historical snapshots for {url}")
             return snapshots
-            
+        
         except Exception as e:
             print_flush(f"Error accessing Wayback Machine for {url}: {str(e)}")
             return []
-    
-    def fetch_historical_rss(self, wayback_url: str) -> Optional[str]:
+
+    def fetch_historical_rss(self, wayback_url: str) -> Optional[bytes]:
         """
-        Fetch RSS content from Wayback Machine
+        Fetch raw RSS content from Wayback Machine, leaving decoding to the XML parser
         """
+        # Snapshots are immutable, so a cached copy is always valid
+        content = self.cache.get_snapshot(wayback_url)
+        if content is not None:
+            return content
+        
         try:
-            response = self.session.get(wayback_url, timeout=30)
+            self.rate_limiter.wait(wayback_url)
+            response = self.session.get(wayback_url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.text
+            self.cache.put_snapshot(wayback_url, response.content)
+            return response.content
         except Exception as e:
             print_flush(f"Error fetching {wayback_url}: {str(e)}")
             return None
-    
-    def parse_historical_feed(self, content: str, snapshot_date: str, source_name: str, country: str) -> List[Dict]:
+
+    def parse_historical_feed(self, content: Union[str, bytes], snapshot_date: str, source_name: str,
+                              country: str, use_lxml: bool = True) -> List[Dict]:
         """
         Parse historical RSS feed content and extract articles
+        
+        Well-formed feeds are read directly with lxml; malformed documents (or
+        use_lxml=False) go through BeautifulSoup. Raw bytes are decoded with the
+        encoding that worked for the source's earlier snapshots, else as declared.
         """
         articles = []
         
         try:
-            soup = BeautifulSoup(content, 'lxml-xml')
+            encoding = None
+            if isinstance(content, bytes):
+                encoding = choose_encoding(content, self.feed_encodings.get(source_name))
+                self.feed_encodings[source_name] = encoding
             
-            # Try different RSS item selectors
-            items = soup.find_all('item')
-            if not items:
-                items = soup.find_all('entry')  # Atom feeds
+            items = parse_feed_items(content, encoding) if use_lxml else None
+            
+            if items is None:
+                soup = BeautifulSoup(content, 'lxml-xml', from_encoding=encoding)
+                
+                # Try different RSS item selectors
+                items = soup.find_all('item')
+                if not items:
+                    items = soup.find_all('entry')  # Atom feeds
             
             for item in items:
                 try:
@@ -120,16 +165,13 @@ class HistoricalNewsScraper:
                     for field in date_fields:
                         date_elem = item.find(field)
                         if date_elem:
-                            try:
-                                date_str = date_elem.get_text().strip()
-                                pub_date = date_parser.parse(date_str)
+                            pub_date = self.date_normalizer.parse(date_elem.get_text().strip(), source_name)
+                            if pub_date:
                                 break
-                            except:
-                                continue
                     
                     # Use snapshot date as fallback
                     if not pub_date:
-                        pub_date = datetime.strptime(snapshot_date, '%Y-%m-%d')
+                        pub_date = to_utc(datetime.strptime(snapshot_date, '%Y-%m-%d'))
                     
                     # Extract URL
                     url = ""
@@ -144,41 +186,38 @@ class HistoricalNewsScraper:
                     for field in desc_fields:
                         desc_elem = item.find(field)
                         if desc_elem:
-                            summary = desc_elem.get_text().strip()
+                            # Only the part of the summary that survives truncation is read
+                            summary, _ = extract_text(desc_elem, SUMMARY_MAX_LENGTH)
                             if summary and len(summary) > 10:
                                 break
                     
-                    # Clean up summary
-                    if summary:
-                        summary = re.sub(r'<[^>]+>', '', summary)  # Remove HTML tags
-                        summary = re.sub(r'\s+', ' ', summary).strip()
-                        if len(summary) > 500:
-                            summary = summary[:497] + "..."
+                    if len(summary) > SUMMARY_MAX_LENGTH:
+                        summary = summary[:SUMMARY_MAX_LENGTH - 3] + "..."
                     
                     if not summary:
                         summary = f"Historical article: {title[:100]}..."
                     
                     articles.append({
                         'title': title,
-                        'publication_date': pub_date.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+                        'publication_date': format_publication_date(pub_date),
+                        'published_at': pub_date,
                         'summary': summary,
                         'url': url,
                         'source': source_name,
                         'country': country,
-                        'language': 'en',  # Default, can be enhanced
                         'historical': True,
                         'snapshot_date': snapshot_date
                     })
-                    
+                
                 except Exception as e:
                     print_flush(f"Error parsing article: {str(e)}")
                     continue
-                    
+        
         except Exception as e:
             print_flush(f"Error parsing feed content: {str(e)}")
-            
+        
         return articles
-    
+
     def scrape_news_archive_pages(self, base_url: str, source_name: str, country: str, start_date: str) -> List[Dict]:
         """
         Try to scrape historical articles from news website archive pages
@@ -197,7 +236,8 @@ class HistoricalNewsScraper:
         
         for archive_url in archive_patterns:
             try:
-                response = self.session.get(archive_url, timeout=30)
+                self.rate_limiter.wait(archive_url)
+                response = self.session.get(archive_url, timeout=REQUEST_TIMEOUT)
                 if response.status_code == 200:
                     print_flush(f"Found archive page: {archive_url}")
                     
@@ -229,23 +269,22 @@ class HistoricalNewsScraper:
                         article_data = self.scrape_individual_article(article_url, source_name, country)
                         if article_data:
                             articles.append(article_data)
-                        
-                        time.sleep(REQUEST_DELAY)  # Rate limiting
                     
                     break  # Found working archive page
-                    
+            
             except Exception as e:
                 print_flush(f"Error accessing archive {archive_url}: {str(e)}")
                 continue
         
         return articles
-    
+
     def scrape_individual_article(self, url: str, source_name: str, country: str) -> Optional[Dict]:
         """
         Scrape individual article page for content
         """
         try:
-            response = self.session.get(url, timeout=30)
+            self.rate_limiter.wait(url)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -263,7 +302,7 @@ class HistoricalNewsScraper:
                 return None
             
             # Extract publication date from meta tags or content
-            pub_date = datetime.now()
+            pub_date = datetime.now(timezone.utc)
             date_selectors = [
                 'meta[property="article:published_time"]',
                 'meta[name="publish-date"]',
@@ -277,11 +316,10 @@ class HistoricalNewsScraper:
                 date_elem = soup.select_one(selector)
                 if date_elem:
                     date_str = date_elem.get('content') or date_elem.get_text()
-                    try:
-                        pub_date = date_parser.parse(date_str)
+                    parsed_date = self.date_normalizer.parse(date_str.strip(), f"{source_name} archive")
+                    if parsed_date:
+                        pub_date = parsed_date
                         break
-                    except:
-                        continue
             
             # Extract content/summary
             summary = ""
@@ -307,118 +345,362 @@ class HistoricalNewsScraper:
             # Clean summary
             if summary:
                 summary = re.sub(r'\s+', ' ', summary).strip()
-                if len(summary) > 500:
-                    summary = summary[:497] + "..."
+                if len(summary) > SUMMARY_MAX_LENGTH:
+                    summary = summary[:SUMMARY_MAX_LENGTH - 3] + "..."
             
             if not summary:
                 summary = f"Article from {source_name}: {title[:100]}..."
             
             return {
                 'title': title,
-                'publication_date': pub_date.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+                'publication_date': format_publication_date(pub_date),
+                'published_at': pub_date,
                 'summary': summary,
                 'url': url,
                 'source': source_name,
                 'country': country,
-                'language': 'en',
                 'historical': True
             }
-            
+        
         except Exception as e:
             print_flush(f"Error scraping article {url}: {str(e)}")
             return None
-    
-    def collect_historical_data(self, months_back: int = 12) -> List[Dict]:
+
+    def _fetch_snapshot(self, snapshot: Dict) -> Optional[bytes]:
         """
-        Main method to collect historical data using multiple approaches
+        Fetch the raw bytes of a snapshot while holding one of the global request slots
         """
-        all_articles = []
-        
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=months_back * 30)
+        with self.request_slots:
+            return self.fetch_historical_rss(snapshot['wayback_url'])
+
+    def _collect_source(self, index: int, country: str, source: Dict, start_date_str: str,
+                        end_date_str: str, snapshot_executor: ThreadPoolExecutor,
+                        events: queue.Queue, done: Dict[str, set]):
+        """
+        Collect historical articles of a single source, reporting each unit of work as an event
         
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
+        Snapshot downloads are handed to the shared snapshot pool, so downloads and
+        parsing of different sources overlap. Every parsed snapshot and the archive
+        page fallback put a ('snapshot' or 'archive', index, item, articles) event on
+        the queue; the source always ends with a 'source_done', 'source_incomplete'
+        (some snapshot download or the archive scrape failed) or 'source_failed' event.
+        Snapshots and archive scrapes listed in done are skipped.
+        """
+        failures = 0
+        try:
+            # Method 1: Wayback Machine RSS snapshots
+            with self.request_slots:
+                snapshots = self.get_wayback_snapshots(
+                    source['url'], 
+                    start_date_str, 
+                    end_date_str
+                )
+            
+            # Process snapshots (limit to prevent overload)
+            selected = [
+                snapshot for snapshot in snapshots[:12]  # Max 12 snapshots per source
+                if snapshot['wayback_url'] and snapshot['wayback_url'] not in done['snapshot']
+            ]
+            futures = [snapshot_executor.submit(self._fetch_snapshot, snapshot) for snapshot in selected]
+            
+            # Parse in snapshot order so results don't depend on download timing
+            for snapshot, future in zip(selected, futures):
+                content = future.result()
+                if content is None:
+                    failures += 1  # Neither it nor its source is checkpointed, so a resumed run retries it
+                    continue
+                if self.archive and content:
+                    self.archive.put(
+                        'historical', source['url'], content,
+                        snapshot_date=snapshot['date'], snapshot_url=snapshot['wayback_url']
+                    )
+                articles = self.parse_historical_feed(
+                    content, 
+                    snapshot['date'], 
+                    source['name'], 
+                    country
+                ) if content else []
+                self.language_detector.tag_articles(articles)
+                events.put(('snapshot', index, snapshot['wayback_url'], articles))
+            
+            # Method 2: Try to find archive pages (for major sources)
+            if len(snapshots) < 5 and source['url'] not in done['archive']:  # If Wayback didn't find much
+                try:
+                    base_url = f"https://{urlparse(source['url']).netloc}"
+                    with self.request_slots:
+                        archive_articles = self.scrape_news_archive_pages(
+                            base_url, 
+                            source['name'], 
+                            country, 
+                            start_date_str
+                        )
+                    self.language_detector.tag_articles(archive_articles)
+                    events.put(('archive', index, source['url'], archive_articles))
+                except Exception as e:
+                    print_flush(f"Archive scraping failed for {source['name']}: {str(e)}")
+                    failures += 1
+            
+            events.put(('source_incomplete' if failures else 'source_done', index, source['url'], []))
+        except Exception as e:
+            print_flush(f"Historical collection failed for {source['name']}: {str(e)}")
+            events.put(('source_failed', index, source['url'], []))
+
+    def _run_sources(self, sources: List[Tuple[str, Dict]], start_date_str: str, end_date_str: str,
+                     done: Optional[Dict[str, set]] = None) -> Iterator[Tuple[str, int, str, List[Dict]]]:
+        """
+        Process sources concurrently and yield their events as they happen
         
-        print_flush(f"Collecting historical data from {start_date_str} to {end_date_str}")
-        print_flush(f"Using multiple approaches: Wayback Machine, Archive scraping")
+        Sources are processed concurrently: CDX lookups, snapshot downloads and
+        parsing of different sources overlap, while HISTORICAL_MAX_CONCURRENCY caps
+        the requests in flight and the shared rate limiter keeps archive.org polite.
         
-        total_sources = sum(len(sources) for sources in RSS_FEEDS.values())
+        Yields:
+            Tuple[str, int, str, List[Dict]]: Event kind, source index, checkpoint item and articles
+        """
+        done = done or {'source': set(), 'snapshot': set(), 'archive': set()}
+        events = queue.Queue()
         
-        with tqdm(total=total_sources, desc="Processing sources for historical data") as pbar:
-            for country, sources in RSS_FEEDS.items():
-                for source in sources:
+        with tqdm(total=len(sources), desc="Processing sources for historical data") as pbar, \
+                ThreadPoolExecutor(max_workers=HISTORICAL_SOURCE_WORKERS) as source_executor, \
+                ThreadPoolExecutor(max_workers=HISTORICAL_MAX_CONCURRENCY) as snapshot_executor:
+            for index, (country, source) in enumerate(sources):
+                source_executor.submit(
+                    self._collect_source, index, country, source, start_date_str, end_date_str,
+                    snapshot_executor, events, done
+                )
+            
+            collected = [0] * len(sources)
+            remaining = len(sources)
+            while remaining:
+                event = events.get()
+                kind, index, _, articles = event
+                country, source = sources[index]
+                collected[index] += len(articles)
+                
+                if kind in ('source_done', 'source_incomplete', 'source_failed'):
+                    remaining -= 1
                     pbar.set_description(f"Historical data: {source['name']} ({country})")
-                    
-                    # Method 1: Wayback Machine RSS snapshots
-                    snapshots = self.get_wayback_snapshots(
-                        source['url'], 
-                        start_date_str, 
-                        end_date_str
-                    )
-                    
-                    # Process snapshots (limit to prevent overload)
-                    for snapshot in snapshots[:12]:  # Max 12 snapshots per source
-                        if snapshot['wayback_url']:
-                            content = self.fetch_historical_rss(snapshot['wayback_url'])
-                            if content:
-                                articles = self.parse_historical_feed(
-                                    content, 
-                                    snapshot['date'], 
-                                    source['name'], 
-                                    country
-                                )
-                                all_articles.extend(articles)
-                        
-                        time.sleep(REQUEST_DELAY)  # Rate limiting
-                    
-                    # Method 2: Try to find archive pages (for major sources)
-                    if len(snapshots) < 5:  # If Wayback didn't find much
-                        try:
-                            base_url = f"https://{urlparse(source['url']).netloc}"
-                            archive_articles = self.scrape_news_archive_pages(
-                                base_url, 
-                                source['name'], 
-                                country, 
-                                start_date_str
-                            )
-                            all_articles.extend(archive_articles)
-                        except Exception as e:
-                            print_flush(f"Archive scraping failed for {source['name']}: {str(e)}")
-                    
-                    time.sleep(REQUEST_DELAY * 2)  # Rate limiting between sources
+                    if kind == 'source_done':
+                        print_flush(f"Collected {collected[index]} historical articles from {source['name']}")
+                    elif kind == 'source_incomplete':
+                        print_flush(
+                            f"Collected {collected[index]} historical articles from {source['name']}, "
+                            f"some downloads failed"
+                        )
                     pbar.update(1)
-        
-        # Remove duplicates based on URL and title
+                
+                yield event
+
+    @staticmethod
+    def _date_range(months_back: int) -> Tuple[str, str]:
+        """Calculate the start and end dates of a collection covering the past months"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=months_back * 30)
+        return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+    @staticmethod
+    def _all_sources() -> List[Tuple[str, Dict]]:
+        """Get every configured feed as a (country, source) pair"""
+        return [(country, source) for country, country_sources in RSS_FEEDS.items() for source in country_sources]
+
+    @staticmethod
+    def _dedupe(articles: List[Dict], seen_urls: set, seen_titles: set) -> List[Dict]:
+        """Remove duplicates based on URL and title, remembering what was seen"""
         unique_articles = []
-        seen_urls = set()
-        seen_titles = set()
         
-        for article in all_articles:
+        for article in articles:
             identifier = f"{article.get('url', '')}-{article.get('title', '')}"
             if identifier not in seen_urls and article.get('title') not in seen_titles:
                 unique_articles.append(article)
                 seen_urls.add(identifier)
                 seen_titles.add(article.get('title', ''))
         
+        return unique_articles
+
+    def collect_historical_data(self, months_back: int = 12) -> List[Dict]:
+        """
+        Main method to collect historical data using multiple approaches
+        
+        Keeps every article in memory and saves nothing; see collect_and_save for
+        long backfills.
+        """
+        start_date_str, end_date_str = self._date_range(months_back)
+        
+        print_flush(f"Collecting historical data from {start_date_str} to {end_date_str}")
+        print_flush(f"Using multiple approaches: Wayback Machine, Archive scraping")
+        
+        sources = self._all_sources()
+        results = [[] for _ in sources]
+        
+        for kind, index, _, articles in self._run_sources(sources, start_date_str, end_date_str):
+            results[index].extend(articles)
+        
+        all_articles = []
+        for articles in results:
+            all_articles.extend(articles)
+        
+        unique_articles = self._dedupe(all_articles, set(), set())
+        
         print_flush(f"Collected {len(unique_articles)} unique historical articles")
+        print_flush(self.cache.summary())
         return unique_articles
-    
+
+    def collect_and_save(self, months_back: int = 12, resume: bool = False,
+                         export_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Collect historical data with checkpoints, committing articles as work completes
+        
+        Articles of every snapshot (and archive page scrape) are inserted together
+        with a checkpoint in one transaction, and each source whose downloads all
+        succeeded is checkpointed too. Nothing is kept in memory beyond the seen
+        URLs/titles, so an interrupted run loses at most the snapshots in flight. A run
+        with failed sources or snapshots is left unfinished; resuming it goes through
+        those sources again and retries only the work without a checkpoint.
+        
+        Args:
+            months_back (int): Months of history to collect for a new run
+            resume (bool): Continue the most recent unfinished run, skipping completed work
+            export_path (str, optional): JSON file the collected articles are streamed to
+        
+        Returns:
+            Dict[str, int]: Numbers of collected and saved articles
+        """
+        with Database() as db:
+            run = db.get_unfinished_historical_run() if resume else None
+            if run:
+                run_id = run['id']
+                start_date_str, end_date_str = run['start_date'], run['end_date']
+                done = db.get_historical_checkpoints(run_id)
+                print_flush(
+                    f"Resuming historical run {run_id} started at {run['started_at']}: "
+                    f"{len(done['source'])} sources and {len(done['snapshot'])} snapshots already done"
+                )
+            else:
+                if resume:
+                    print_flush("No unfinished historical run to resume, starting a new one")
+                start_date_str, end_date_str = self._date_range(months_back)
+                run_id = db.start_historical_run(start_date_str, end_date_str)
+                done = {'source': set(), 'snapshot': set(), 'archive': set()}
+            
+            print_flush(f"Collecting historical data from {start_date_str} to {end_date_str}")
+            print_flush(f"Using multiple approaches: Wayback Machine, Archive scraping")
+            
+            sources = [
+                (country, source) for country, source in self._all_sources()
+                if source['url'] not in done['source']
+            ]
+            seen_urls, seen_titles = set(), set()
+            unfinished_sources = 0
+            collected_count = 0
+            saved_count = 0
+            export_file = open(export_path, 'w', encoding='utf-8') if export_path else None
+            
+            try:
+                if export_file:
+                    export_file.write('[')
+                
+                for kind, index, item, articles in self._run_sources(sources, start_date_str, end_date_str, done):
+                    if kind in ('source_incomplete', 'source_failed'):
+                        unfinished_sources += 1
+                        continue
+                    
+                    unique_articles = self._dedupe(articles, seen_urls, seen_titles)
+                    saved_count += db.save_historical_checkpoint(
+                        run_id,
+                        'source' if kind == 'source_done' else kind,
+                        item,
+                        unique_articles
+                    )
+                    
+                    if export_file:
+                        for article in unique_articles:
+                            export_file.write(',\n' if collected_count else '\n')
+                            export_file.write(json.dumps(without_datetime(article), indent=2, ensure_ascii=False))
+                            collected_count += 1
+                    else:
+                        collected_count += len(unique_articles)
+                
+                if export_file:
+                    export_file.write('\n]\n')
+            finally:
+                if export_file:
+                    export_file.close()
+            
+            if unfinished_sources:
+                print_flush(
+                    f"{unfinished_sources} sources had failed downloads; "
+                    f"run with --resume to retry them (historical run {run_id})"
+                )
+            else:
+                db.finish_historical_run(run_id)
+        
+        print_flush(f"Collected {collected_count} unique historical articles")
+        print_flush(f"Successfully saved {saved_count} historical articles to database")
+        print_flush(self.cache.summary())
+        return {'collected': collected_count, 'saved': saved_count}
+
+    def replay_and_save(self, archive: PayloadArchive, export_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Parse the archived Wayback snapshots again and save the articles, without network access
+        
+        Snapshots are replayed source by source in configuration order, each source's
+        in date order, as a collection run processes them. Archive page scrapes are
+        not kept in the payload archive, so they are not replayed.
+        
+        Args:
+            archive (PayloadArchive): Archive to replay
+            export_path (str, optional): JSON file the unique articles are written to
+        
+        Returns:
+            Dict[str, int]: Numbers of collected and saved articles
+        """
+        sources = self._all_sources()
+        order = {source['url']: index for index, (_, source) in enumerate(sources)}
+        entries = sorted(
+            (entry for entry in archive.entries('historical') if entry['feed_url'] in order),
+            key=lambda entry: (order[entry['feed_url']], entry['snapshot_date'], entry['snapshot_url'])
+        )
+        
+        all_articles = []
+        for entry in tqdm(entries, desc="Replaying archived snapshots"):
+            content = archive.read(entry)
+            if content is None:
+                print_flush(f"Skipping archived snapshot {entry['snapshot_url']}: payload missing")
+                continue
+            country, source = sources[order[entry['feed_url']]]
+            articles = self.parse_historical_feed(content, entry['snapshot_date'], source['name'], country)
+            all_articles.extend(self.language_detector.tag_articles(articles))
+        
+        unique_articles = self._dedupe(all_articles, set(), set())
+        print_flush(f"Replayed {len(entries)} archived snapshots into {len(unique_articles)} unique historical articles")
+        
+        if export_path:
+            with open(export_path, 'w', encoding='utf-8') as f:
+                json.dump([without_datetime(article) for article in unique_articles], f, indent=2, ensure_ascii=False)
+        
+        saved_count = self.save_historical_data(unique_articles)
+        return {'collected': len(unique_articles), 'saved': saved_count}
+
     def save_historical_data(self, articles: List[Dict]) -> int:
         """
         Save historical articles to database
         """
         saved_count = 0
+        failed_count = 0
         
-        with Database() as db:
-            for article in tqdm(articles, desc="Saving historical articles"):
+        with Database() as db, tqdm(total=len(articles), desc="Saving historical articles") as pbar:
+            for start in range(0, len(articles), INSERT_BATCH_SIZE):
+                batch = articles[start:start + INSERT_BATCH_SIZE]
                 try:
-                    if db.insert_article(article):
-                        saved_count += 1
+                    counts = db.insert_articles(batch)
+                    saved_count += counts['inserted']
+                    failed_count += counts['failed']
                 except Exception as e:
-                    print_flush(f"Error saving article '{article.get('title', '')}': {str(e)}")
+                    print_flush(f"Error saving {len(batch)} historical articles: {str(e)}")
+                pbar.update(len(batch))
         
+        if failed_count:
+            print_flush(f"Skipped {failed_count} historical articles with missing or invalid fields")
         print_flush(f"Successfully saved {saved_count} historical articles to database")
         return saved_count
 
@@ -426,37 +708,77 @@ def main():
     """
     Main function to run historical data collection
     """
+    arg_parser = argparse.ArgumentParser(description="Collect historical news articles")
+    arg_parser.add_argument(
+        '--months',
+        type=int,
+        default=12,
+        help="months of history to collect (default: 12)"
+    )
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '--resume',
+        action='store_true',
+        help="continue the last interrupted run, skipping sources and snapshots already saved"
+    )
+    mode.add_argument(
+        '--replay',
+        action='store_true',
+        help="parse and save the snapshots in the payload archive again instead of collecting (no network access)"
+    )
+    arg_parser.add_argument(
+        '--archive',
+        action='store_true',
+        help="keep every fetched snapshot in the payload archive (also set by ARCHIVE_PAYLOADS)"
+    )
+    args = arg_parser.parse_args()
+    
+    scraper = HistoricalNewsScraper()
+    
+    # Collect historical data, saving and exporting it as each source progresses
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_filename = f"data/historical_articles_{timestamp}.json"
+    os.makedirs('data', exist_ok=True)
+    
+    if args.replay:
+        print_flush("=== Historical News Data Replay ===")
+        archive = scraper.archive or PayloadArchive()
+        try:
+            counts = scraper.replay_and_save(archive, export_path=json_filename)
+        finally:
+            archive.close()
+        print_flush(f"- Replayed: {counts['collected']} articles")
+        print_flush(f"- Saved to database: {counts['saved']} articles")
+        print_flush(f"- Exported to: {json_filename}")
+        return
+    
+    if args.archive and scraper.archive is None:
+        scraper.archive = PayloadArchive()
+    
     print_flush("=== Historical News Data Collection ===")
-    print_flush("This will collect news articles from the past 12 months using:")
+    print_flush(f"This will collect news articles from the past {args.months} months using:")
     print_flush("1. Wayback Machine RSS feed snapshots")
     print_flush("2. News website archive page scraping")
     print_flush("3. Multiple fallback methods")
     print_flush("")
     
-    scraper = HistoricalNewsScraper()
-    
-    # Collect historical data
-    historical_articles = scraper.collect_historical_data(months_back=12)
+    counts = scraper.collect_and_save(
+        months_back=args.months,
+        resume=args.resume,
+        export_path=json_filename
+    )
     
-    if historical_articles:
-        # Save to database
-        saved_count = scraper.save_historical_data(historical_articles)
-        
-        # Export to files
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save to JSON
-        json_filename = f"data/historical_articles_{timestamp}.json"
-        os.makedirs('data', exist_ok=True)
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(historical_articles, f, indent=2, ensure_ascii=False)
-        
+    if counts['collected']:
         print_flush(f"Historical data collection completed!")
-        print_flush(f"- Collected: {len(historical_articles)} articles")
-        print_flush(f"- Saved to database: {saved_count} articles")
+        print_flush(f"- Collected: {counts['collected']} articles")
+        print_flush(f"- Saved to database: {counts['saved']} articles")
         print_flush(f"- Exported to: {json_filename}")
     else:
+        os.remove(json_filename)
         print_flush("No historical articles were collected.")
+    
+    if scraper.archive:
+        print_flush(scraper.archive.summary())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
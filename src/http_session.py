@@ -0,0 +1,55 @@
+"""
+Shared HTTP session layer for the RSS feed scrapers
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    HEADERS, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_MAXSIZE_BY_HOST,
+    CONNECT_TIMEOUT, READ_TIMEOUT
+)
+
+# Separate connect and read timeouts for every request
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session() -> requests.Session:
+    """
+    Create a keep-alive session with pooled connections and compression enabled
+    
+    Every host gets its own pool of HTTP_POOL_MAXSIZE connections, unless it has an
+    override in HTTP_POOL_MAXSIZE_BY_HOST. Retries are left to the callers.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    # Hosts with their own pool size get a dedicated adapter
+    for host, maxsize in HTTP_POOL_MAXSIZE_BY_HOST.items():
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=maxsize)
+        session.mount(f'http://{host}/', host_adapter)
+        session.mount(f'https://{host}/', host_adapter)
+    
+    return session
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide shared session, creating it on first use
+    """
+    global _session
+    
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
@@ -0,0 +1,187 @@
+"""
+Cached language identification for scraped and historical articles
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from langdetect import DetectorFactory, detect
+
+from config import RSS_FEEDS, LANGUAGE_CACHE_SIZE, LANGDETECT_SEED
+
+# Make langdetect's sampling reproducible, so the same text always gets the same language
+DetectorFactory.seed = LANGDETECT_SEED
+
+_SCRIPTS = {
+    'kana': re.compile(r'[\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f]'),
+    'han': re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff]'),
+    'hangul': re.compile(r'[\u1100-\u11ff\u3130-\u318f\uac00-\ud7af]'),
+    'arabic': re.compile(r'[\u0600-\u06ff\u0750-\u077f\ufb50-\ufdff\ufe70-\ufeff]'),
+    'cyrillic': re.compile(r'[\u0400-\u04ff]')
+}
+_LETTERS = re.compile(r'[^\W\d_]')
+_WHITESPACE = re.compile(r'\s+')
+
+# Languages written in each script, and the one assumed when the source says otherwise
+_SCRIPT_LANGUAGES = {
+    'han': ({'ja', 'zh', 'zh-cn', 'zh-tw'}, None),
+    'hangul': ({'ko'}, 'ko'),
+    'arabic': ({'ar', 'fa', 'ur', 'ps'}, 'ar'),
+    'cyrillic': ({'ru', 'uk', 'bg', 'sr', 'mk', 'be', 'kk'}, 'ru')
+}
+
+def source_priors() -> Dict[str, str]:
+    """Map source names to the language configured for them in RSS_FEEDS"""
+    return {
+        source['name']: source['language']
+        for country_sources in RSS_FEEDS.values()
+        for source in country_sources
+        if source.get('language')
+    }
+
+def dominant_script(text: str) -> Optional[str]:
+    """
+    Get the non-Latin script making up most of the letters of a text
+    
+    Japanese mixes kana with Han characters, so any kana among CJK text counts as kana.
+    
+    Returns:
+        Optional[str]: 'kana', 'han', 'hangul', 'arabic', 'cyrillic', or None for
+            Latin (or other) text
+    """
+    letters = len(_LETTERS.findall(text))
+    if not letters:
+        return None
+    
+    counts = {script: len(pattern.findall(text)) for script, pattern in _SCRIPTS.items()}
+    if counts['kana'] and counts['kana'] + counts['han'] > letters / 2:
+        return 'kana'
+    script, count = max(counts.items(), key=lambda item: item[1])
+    return script if count > letters / 2 else None
+
+class LanguageDetector:
+    """
+    Layered language identification
+    
+    Each text goes through the cheapest layer that can decide it:
+    1. Its Unicode script, for Japanese, Korean, Arabic and Cyrillic text
+    2. The language configured for its source in RSS_FEEDS
+    3. A memo of earlier langdetect results keyed by the hash of the normalized text
+    4. langdetect itself, seeded so results are reproducible
+    """
+
+    def __init__(self, priors: Optional[Dict[str, str]] = None, cache_size: int = LANGUAGE_CACHE_SIZE):
+        self.priors = source_priors() if priors is None else priors
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'script': 0, 'prior': 0, 'cache': 0, 'langdetect': 0}
+
+    def _from_script(self, text: str, prior: Optional[str]) -> Optional[str]:
+        """Decide the language from the text's script, keeping the prior when it uses that script"""
+        script = dominant_script(text)
+        if script is None:
+            return None
+        if script == 'kana':
+            return 'ja'
+        
+        languages, default = _SCRIPT_LANGUAGES[script]
+        if prior in languages:
+            return prior
+        return default  # Han text without a CJK prior is left to langdetect
+
+    def _from_langdetect(self, text: str) -> str:
+        """Run langdetect on a text, memoizing the result by the hash of the normalized text"""
+        normalized = _WHITESPACE.sub(' ', text).strip().lower()
+        key = hashlib.sha1(normalized.encode('utf-8')).digest()
+        
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.stats['cache'] += 1
+                return self.cache[key]
+        
+        try:
+            language = detect(normalized)
+        except Exception:
+            language = "en"  # Default to English
+        
+        with self.lock:
+            self.stats['langdetect'] += 1
+            self.cache[key] = language
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return language
+
+    def detect(self, text: str, source: Optional[str] = None, prior: Optional[str] = None) -> str:
+        """
+        Identify the language of a text
+        
+        Args:
+            text (str): Text to identify, usually title and summary
+            source (str, optional): Source name whose configured language is the prior
+            prior (str, optional): Expected language, overriding the source's configured one
+        
+        Returns:
+            str: Language code, 'en' when the text is too short to tell and there is no prior
+        """
+        prior = prior or self.priors.get(source)
+        
+        language = self._from_script(text, prior)
+        if language:
+            self.stats['script'] += 1
+            return language
+        
+        if prior:
+            self.stats['prior'] += 1
+            return prior
+        
+        if not text or len(text.strip()) <= 10:
+            return "en"  # Default to English
+        
+        return self._from_langdetect(text)
+
+    def detect_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Identify the languages of many texts at once
+        
+        Args:
+            items (List[Tuple[str, Optional[str]]]): (text, source name) pairs
+        
+        Returns:
+            List[str]: Language codes in the same order; repeated texts are only identified once
+        """
+        decided = {}
+        languages = []
+        for text, source in items:
+            key = (text, source)
+            if key not in decided:
+                decided[key] = self.detect(text, source)
+            languages.append(decided[key])
+        return languages
+
+    def tag_articles(self, articles: List[Dict], prior: Optional[str] = None) -> List[Dict]:
+        """
+        Set the language of articles from their title and summary
+        
+        Args:
+            articles (List[Dict]): Articles to tag in place
+            prior (str, optional): Expected language of all articles, instead of the
+                language configured for each article's source
+        
+        Returns:
+            List[Dict]: The same articles
+        """
+        if prior:
+            for article in articles:
+                article['language'] = self.detect(f"{article['title']} {article['summary']}", prior=prior)
+            return articles
+        
+        languages = self.detect_batch([
+            (f"{article['title']} {article['summary']}", article.get('source')) for article in articles
+        ])
+        for article, language in zip(articles, languages):
+            article['language'] = language
+        return articles
@@ -6,10 +6,14 @@ import json
 import csv
 import os
 import sys
+import time
+import argparse
 from datetime import datetime
 from scraper import RSSFeedScraper
-from database import Database
-from config import UPDATE_INTERVAL
+from scheduler import FeedScheduler
+from date_normalizer import without_datetime
+from payload_archive import PayloadArchive
+from config import UPDATE_INTERVAL, MIN_POLL_INTERVAL, PIPELINE_QUEUE_SIZE, HEDGE_AFTER
 
 def print_flush(message):
     """Print message and flush immediately for real-time logging"""
@@ -24,7 +28,7 @@ def save_to_json(articles):
     """Save articles to JSON file"""
     filename = f"data/articles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, ensure_ascii=False, indent=2)
+        json.dump([without_datetime(article) for article in articles], f, ensure_ascii=False, indent=2)
     print_flush(f"Saved {len(articles)} articles to {filename}")
 
 def save_to_csv(articles):
@@ -43,7 +47,7 @@ def save_to_csv(articles):
         for article in articles:
             # Clean any potential issues with the data
             clean_article = {}
-            for key, value in article.items():
+            for key, value in without_datetime(article).items():
                 if value is None:
                     clean_article[key] = ""
                 else:
@@ -58,24 +62,6 @@ def save_to_csv(articles):
             writer.writerow(clean_article)
     print_flush(f"Saved {len(articles)} articles to {filename}")
 
-def save_to_database(articles):
-    """Save articles to SQLite database"""
-    if not articles:
-        print_flush("No articles to save to database")
-        return
-    
-    with Database() as db:
-        new_articles = 0
-        duplicate_articles = 0
-        
-        for article in articles:
-            if db.insert_article(article):
-                new_articles += 1
-            else:
-                duplicate_articles += 1
-        
-        print_flush(f"Database: {new_articles} new articles, {duplicate_articles} duplicates skipped")
-
 def print_stats(articles):
     """Print statistics about the scraped articles"""
     if not articles:
@@ -104,22 +90,87 @@ def print_stats(articles):
     for source, count in sorted(sources.items()):
         print_flush(f"  {source}: {count}")
 
-def scrape_and_save():
+def print_run_summary(scraper):
+    """Print feed fetch outcomes and quarantined feeds of the last scrape run"""
+    summary = scraper.run_summary
+    print_flush(
+        f"Feeds: {summary['fetched']} fetched, {summary['not_modified']} not modified (304), "
+        f"{summary['unchanged']} unchanged, {summary['failed']} failed, "
+        f"{summary['quarantined']} quarantined, {summary['timed_out']} timed out, "
+        f"{summary['cancelled']} cancelled"
+    )
+    
+    fetched = {url: result for url, result in scraper.feed_results.items() if result['status'] == 'fetched'}
+    if fetched:
+        # Streams that stop at an item seen before never download the rest, so it can't be counted
+        counted = [result['skipped'] for result in fetched.values() if result['skipped'] is not None]
+        skipped = f"{sum(counted)} skipped as already ingested"
+        if len(counted) < len(fetched):
+            skipped += f", plus an unknown number in {len(fetched) - len(counted)} feeds whose download stopped early"
+        print_flush(f"Items: {sum(result['new'] for result in fetched.values())} new, {skipped}")
+        for url, result in fetched.items():
+            skipped = 'unknown number' if result['skipped'] is None else result['skipped']
+            print_flush(f"  {url}: {result['new']} new, {skipped} skipped")
+    
+    quarantined = scraper.circuit_breaker.quarantined()
+    if quarantined:
+        print_flush("Quarantined feeds:")
+        for entry in quarantined:
+            print_flush(
+                f"  {entry['feed_url']}: {entry['failures']} failures, "
+                f"retry after {entry['retry_at']} ({entry['last_error']})"
+            )
+    
+    cut_off = [url for url, result in scraper.feed_results.items() if result['status'] in ('timed_out', 'cancelled')]
+    if cut_off:
+        print_flush("Feeds cut off by the run's deadlines (fetched first next run):")
+        for url in cut_off:
+            print_flush(f"  {url}: {scraper.feed_results[url]['status']}")
+    if HEDGE_AFTER is not None:
+        print_flush(
+            f"Hedged requests: {scraper.deadline_stats['hedged']} sent, "
+            f"{scraper.deadline_stats['hedge_wins']} answered first"
+        )
+    
+    stats = scraper.pipeline_stats
+    print_flush(
+        f"Pipeline: {stats['parse_workers']} parse workers, peak queue depth "
+        f"{stats['parse_queue_peak']} awaiting parse / {stats['store_queue_peak']} awaiting store "
+        f"(capacity {PIPELINE_QUEUE_SIZE})"
+    )
+
+def print_store_summary(scraper):
+    """Print how many articles the last scrape run stored in the database"""
+    print_flush(
+        f"Database: {scraper.store_summary['new']} new articles, "
+        f"{scraper.store_summary['duplicates']} duplicates skipped"
+    )
+
+def scrape_and_save(archive: bool = False):
     """
     Scrape RSS feeds and save articles to files
+    
+    Args:
+        archive (bool): Keep the raw body of every fetched feed in the payload archive
     """
     print_flush(f"Starting scrape at {datetime.now().isoformat()}")
     
     # Initialize scraper
     print_flush("Initializing RSS scraper...")
     scraper = RSSFeedScraper()
+    if archive:
+        scraper.archive = PayloadArchive()
     
     try:
-        # Scrape feeds
+        # Scrape feeds, storing articles in the database as they are parsed
         print_flush("Starting to scrape RSS feeds...")
-        articles = scraper.scrape_feeds()
+        articles = scraper.scrape_feeds(store=True)
         
         print_flush(f"Scraping completed. Found {len(articles)} articles.")
+        print_run_summary(scraper)
+        print_store_summary(scraper)
+        if scraper.archive:
+            print_flush(scraper.archive.summary())
         
         # Create data directory
         print_flush("Creating data directory...")
@@ -132,10 +183,6 @@ def scrape_and_save():
         print_flush("Saving to CSV file...")
         save_to_csv(articles)
         
-        # Save to database
-        print_flush("Saving to database...")
-        save_to_database(articles)
-        
         # Print statistics
         print_flush("Generating statistics...")
         print_stats(articles)
@@ -146,17 +193,119 @@ def scrape_and_save():
         print_flush(f"Error during scrape: {str(e)}")
         sys.stderr.write(f"Error during scrape: {str(e)}\n")
         sys.stderr.flush()
+    finally:
+        scraper.close()
+
+def replay_and_save():
+    """
+    Parse the archived raw feed payloads again and save the articles, without network access
+    """
+    print_flush(f"Starting replay at {datetime.now().isoformat()}")
+    scraper = RSSFeedScraper()
+    archive = PayloadArchive()
+    
+    try:
+        start = time.perf_counter()
+        articles = scraper.replay_archive(archive, store=True)
+        elapsed = time.perf_counter() - start
+        
+        print_flush(
+            f"Replay completed in {elapsed:.2f}s. Parsed {scraper.replay_summary['payloads']} payloads "
+            f"({scraper.replay_summary['skipped']} skipped) into {len(articles)} articles."
+        )
+        print_store_summary(scraper)
+        
+        ensure_data_dir()
+        save_to_json(articles)
+        save_to_csv(articles)
+        print_stats(articles)
+    
+    except Exception as e:
+        print_flush(f"Error during replay: {str(e)}")
+        sys.stderr.write(f"Error during replay: {str(e)}\n")
+        sys.stderr.flush()
+    finally:
+        archive.close()
+
+def run_scheduler(archive: bool = False):
+    """
+    Poll feeds forever, each at the cadence learned from its publishing rate
+    
+    A poll that fails as a whole leaves its feeds due, so the next one waits
+    MIN_POLL_INTERVAL, doubling after each further failure up to UPDATE_INTERVAL.
+    
+    Args:
+        archive (bool): Keep the raw body of every fetched feed in the payload archive
+    """
+    print_flush(f"Starting scheduler at {datetime.now().isoformat()}")
+    scraper = RSSFeedScraper()
+    if archive:
+        scraper.archive = PayloadArchive()
+    scheduler = FeedScheduler(scraper.all_sources())
+    ensure_data_dir()
+    
+    # Every poll reuses the scraper, and with it its parse workers
+    failed_polls = 0
+    while True:
+        due_sources = scheduler.due_sources()
+        
+        if due_sources:
+            print_flush(f"Polling {len(due_sources)} due feeds...")
+            try:
+                scraper.scrape_feeds(due_sources, store=True)
+                print_run_summary(scraper)
+                print_store_summary(scraper)
+                scheduler.record_results(scraper.feed_results)
+                failed_polls = 0
+            except Exception as e:
+                failed_polls += 1
+                print_flush(f"Error during scheduled scrape: {str(e)}")
+                sys.stderr.write(f"Error during scheduled scrape: {str(e)}\n")
+                sys.stderr.flush()
+        
+        wait = scheduler.seconds_until_next()
+        if failed_polls:
+            backoff = MIN_POLL_INTERVAL * 60 * 2 ** (failed_polls - 1)
+            wait = max(wait, min(backoff, UPDATE_INTERVAL * 3600))
+        print_flush(f"Next poll in {int(wait)} seconds")
+        time.sleep(max(wait, 1))
 
 def main():
     """
     Main function to run the scraper with database storage
     """
+    arg_parser = argparse.ArgumentParser(description="RSS feed scraper with database storage")
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '--schedule',
+        action='store_true',
+        help="run continuously, polling each feed at its learned update cadence"
+    )
+    mode.add_argument(
+        '--replay',
+        action='store_true',
+        help="parse and store the feed bodies in the payload archive again instead of fetching feeds"
+    )
+    arg_parser.add_argument(
+        '--archive',
+        action='store_true',
+        help="keep the raw body of every fetched feed in the payload archive (also set by ARCHIVE_PAYLOADS)"
+    )
+    args = arg_parser.parse_args()
+    
     print_flush("RSS Feed Scraper (with Database)")
     print_flush("--------------------------------")
-    print_flush(f"Update interval: {UPDATE_INTERVAL} hours")
     
-    # Run scraper
-    scrape_and_save()
+    if args.replay:
+        print_flush("Replaying the payload archive (no network access)")
+        replay_and_save()
+    elif args.schedule:
+        print_flush(f"Adaptive scheduling enabled (initial interval: {UPDATE_INTERVAL} hours)")
+        run_scheduler(archive=args.archive)
+    else:
+        print_flush(f"Update interval: {UPDATE_INTERVAL} hours")
+        # Run scraper
+        scrape_and_save(archive=args.archive)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
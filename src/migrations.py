@@ -0,0 +1,96 @@
+"""
+Versioned schema migrations of the news database
+
+The schema version is kept in SQLite's user_version. Opening a Database applies
+any pending migrations, so existing data/news.db files are upgraded in place;
+run this module to upgrade a database file explicitly:
+
+    python src/migrations.py [--db data/news.db]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from typing import List
+
+from config import (
+    DATABASE_PATH, TABLE_SCHEMA, NEWS_INDEXES, NEWS_FTS_SCHEMA, FEED_STATE_SCHEMA, FEED_WATERMARK_SCHEMA,
+    FEED_PROFILE_SCHEMA, FEED_CUTOFF_SCHEMA, FEED_SCHEDULE_SCHEMA, FEED_HEALTH_SCHEMA,
+    HISTORICAL_RUNS_SCHEMA, HISTORICAL_CHECKPOINTS_SCHEMA
+)
+
+# (version, description, statements) in order; released migrations must never change
+MIGRATIONS = [
+    (1, "Article, feed bookkeeping and historical run tables", [
+        TABLE_SCHEMA, FEED_STATE_SCHEMA, FEED_WATERMARK_SCHEMA, FEED_PROFILE_SCHEMA,
+        FEED_CUTOFF_SCHEMA, FEED_SCHEDULE_SCHEMA, FEED_HEALTH_SCHEMA,
+        HISTORICAL_RUNS_SCHEMA, HISTORICAL_CHECKPOINTS_SCHEMA
+    ]),
+    (2, "Indexes for article listing and statistics", NEWS_INDEXES),
+    (3, "Full-text search over article titles and summaries", NEWS_FTS_SCHEMA)
+]
+
+def print_flush(message):
+    """Print message and flush immediately for real-time logging"""
+    print(message)
+    sys.stdout.flush()
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Get the version of the last migration applied to a database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply the pending migrations of a database in order, each in its own transaction
+    
+    Databases created before versioning have version 0; their first migration only
+    creates what is missing, as its statements are all IF NOT EXISTS. Each migration
+    takes the write lock before checking the version again, so processes opening
+    the database at the same time apply it once.
+    
+    Returns:
+        List[int]: Versions of the migrations applied
+    """
+    applied = []
+    for version, _, statements in MIGRATIONS:
+        if schema_version(conn) >= version:
+            continue
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade the news database schema in place")
+    parser.add_argument('--db', default=DATABASE_PATH, help=f"database file (default: {DATABASE_PATH})")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.db):
+        print_flush(f"No database at {args.db}")
+        return
+    
+    conn = sqlite3.connect(args.db)
+    try:
+        current = schema_version(conn)
+        applied = migrate(conn)
+        descriptions = {version: description for version, description, _ in MIGRATIONS}
+        for version in applied:
+            print_flush(f"Applied migration {version}: {descriptions[version]}")
+        print_flush(f"Schema version {current} -> {schema_version(conn)}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
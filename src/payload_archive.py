@@ -0,0 +1,119 @@
+"""
+Archive of raw fetched feed bodies, for reprocessing and benchmarking offline
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config import PAYLOAD_ARCHIVE_DIR, PAYLOAD_ARCHIVE_SCHEMA
+
+class PayloadArchive:
+    """
+    Gzip-compressed feed bodies stored once per content, with an index of every fetch
+    
+    Bodies are files named by their SHA-256, so a feed that is fetched again
+    unchanged only adds an index row. The index is a SQLite database inside the
+    archive directory, which makes the directory self-contained: it can be copied
+    elsewhere and replayed against a fresh news database.
+    """
+
+    def __init__(self, archive_dir: str = PAYLOAD_ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.payload_dir = os.path.join(archive_dir, 'payloads')
+        os.makedirs(self.payload_dir, exist_ok=True)
+        
+        # Shared by fetch threads; every use holds the lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(archive_dir, 'index.db'), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(PAYLOAD_ARCHIVE_SCHEMA)
+        self.stats = {'archived': 0, 'stored': 0}
+
+    def _path(self, body_hash: str) -> str:
+        """Get the file path of a body"""
+        return os.path.join(self.payload_dir, f"{body_hash}.gz")
+
+    def put(self, kind: str, feed_url: str, body: bytes, encoding: Optional[str] = None,
+            complete: bool = True, snapshot_date: Optional[str] = None,
+            snapshot_url: Optional[str] = None):
+        """
+        Archive a fetched body
+        
+        Args:
+            kind (str): 'live' for feed fetches, 'historical' for Wayback snapshots
+            feed_url (str): URL of the feed
+            body (bytes): Raw body as received
+            encoding (str, optional): Encoding the body was decoded with
+            complete (bool): False when the download stopped before the end of the feed
+            snapshot_date (str, optional): Date of a historical snapshot
+            snapshot_url (str, optional): Wayback URL of a historical snapshot; a
+                snapshot is only indexed once
+        """
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._path(body_hash)
+        stored = False
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+            stored = True
+        
+        with self.lock:
+            cursor = self.conn.execute("""
+                INSERT OR IGNORE INTO payloads (
+                    kind, feed_url, fetched_at, snapshot_date, snapshot_url,
+                    body_hash, encoding, size, complete
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                kind, feed_url, datetime.now(timezone.utc).isoformat(), snapshot_date, snapshot_url,
+                body_hash, encoding, len(body), int(complete)
+            ))
+            self.conn.commit()
+            self.stats['archived'] += cursor.rowcount
+            self.stats['stored'] += stored
+
+    def entries(self, kind: str) -> List[Dict]:
+        """
+        Get the archived fetches of a kind in the order they happened
+        
+        Args:
+            kind (str): 'live' or 'historical'
+        
+        Returns:
+            List[Dict]: Index rows, oldest first
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM payloads WHERE kind = ? ORDER BY fetched_at, id", (kind,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def read(self, entry: Dict) -> Optional[bytes]:
+        """
+        Get the body of an archived fetch
+        
+        Returns:
+            Optional[bytes]: Raw body, or None when its file is missing or corrupt
+        """
+        try:
+            with gzip.open(self._path(entry['body_hash']), 'rb') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def summary(self) -> str:
+        """Describe what the current run archived for logging"""
+        return (
+            f"Payload archive: {self.stats['archived']} fetches archived, "
+            f"{self.stats['stored']} new bodies stored in {self.archive_dir}"
+        )
+
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
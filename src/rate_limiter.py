@@ -0,0 +1,85 @@
+"""
+Per-host token bucket rate limiting shared by the scrapers
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from config import RATE_LIMIT_RATE, RATE_LIMIT_BURST, RATE_LIMIT_OVERRIDES
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available
+        
+        The token is reserved under the lock and the wait happens outside it, so
+        concurrent callers queue up fairly instead of polling.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class HostRateLimiter:
+    def __init__(self,
+                 rate: float = RATE_LIMIT_RATE,
+                 burst: int = RATE_LIMIT_BURST,
+                 overrides: Optional[Dict[str, Dict]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = RATE_LIMIT_OVERRIDES if overrides is None else overrides
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Get (or create) the token bucket of a host"""
+        with self.lock:
+            if host not in self.buckets:
+                override = self.overrides.get(host, {})
+                self.buckets[host] = TokenBucket(
+                    override.get('rate', self.rate),
+                    override.get('burst', self.burst)
+                )
+            return self.buckets[host]
+
+    def wait(self, url: str) -> float:
+        """
+        Block until a request to the url's host is allowed
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlparse(url).hostname or ''
+        return self._bucket(host.lower()).acquire()
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> HostRateLimiter:
+    """
+    Get the process-wide shared rate limiter, creating it on first use
+    """
+    global _rate_limiter
+    
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = HostRateLimiter()
+        return _rate_limiter
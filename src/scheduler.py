@@ -0,0 +1,129 @@
+"""
+Adaptive polling scheduler that learns how often each feed publishes
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from dateutil import parser as date_parser
+
+from config import (
+    UPDATE_INTERVAL, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL, POLL_GAP_FACTOR,
+    POLL_BACKOFF_FACTOR, POLL_SMOOTHING, POLL_JITTER
+)
+from database import Database
+
+class FeedScheduler:
+    def __init__(self, sources: List[Tuple[str, Dict]]):
+        self.sources = sources
+        self.min_interval = MIN_POLL_INTERVAL * 60
+        self.max_interval = MAX_POLL_INTERVAL * 60
+        
+        with Database() as db:
+            self.schedules = db.get_feed_schedules()
+        
+        # Feeds never polled before are due immediately
+        now = datetime.now().isoformat()
+        for _, source in sources:
+            if source['url'] not in self.schedules:
+                self.schedules[source['url']] = {
+                    'feed_url': source['url'],
+                    'poll_interval': self._clamp(UPDATE_INTERVAL * 3600),
+                    'next_poll': now
+                }
+
+    def _clamp(self, interval: float) -> float:
+        """Keep an interval within the configured min/max bounds"""
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _jitter(self, interval: float) -> float:
+        """Spread polls randomly so feeds don't synchronize"""
+        return interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def estimate_gap(self, articles: List[Dict]) -> Optional[float]:
+        """
+        Estimate the average number of seconds between items of a feed
+        
+        Args:
+            articles (List[Dict]): Articles from a single poll of the feed
+        
+        Returns:
+            Optional[float]: Average gap, or None with fewer than two distinct timestamps
+        """
+        timestamps = set()
+        for article in articles:
+            try:
+                published_at = article.get('published_at') or date_parser.parse(article['publication_date'])
+                timestamps.add(published_at.timestamp())
+            except Exception:
+                continue
+        
+        if len(timestamps) < 2:
+            return None
+        
+        return (max(timestamps) - min(timestamps)) / (len(timestamps) - 1)
+
+    def record_result(self, url: str, status: str, articles: List[Dict]):
+        """
+        Update a feed's poll interval from its latest poll and schedule the next one
+        
+        Feeds that returned new items learn from the spacing of their timestamps;
+        feeds that were unchanged or had nothing new back off, and failed feeds keep
+        their current interval. Feeds cut off by the run's deadlines keep their
+        interval too, but are retried after MIN_POLL_INTERVAL; feeds that keep timing
+        out are quarantined by the circuit breaker.
+        """
+        schedule = self.schedules[url]
+        if status in ('timed_out', 'cancelled'):
+            retry_delay = self._jitter(self.min_interval)
+            schedule['next_poll'] = (datetime.now() + timedelta(seconds=retry_delay)).isoformat()
+            return
+        
+        interval = schedule['poll_interval']
+        
+        gap = self.estimate_gap(articles) if status == 'fetched' else None
+        if gap is not None:
+            estimate = gap * POLL_GAP_FACTOR
+            interval = POLL_SMOOTHING * estimate + (1 - POLL_SMOOTHING) * interval
+        elif status in ('not_modified', 'unchanged') or (status == 'fetched' and not articles):
+            interval *= POLL_BACKOFF_FACTOR
+        
+        interval = self._clamp(interval)
+        schedule['poll_interval'] = interval
+        schedule['next_poll'] = (datetime.now() + timedelta(seconds=self._jitter(interval))).isoformat()
+
+    def record_results(self, feed_results: Dict[str, Dict]):
+        """
+        Record the results of a scrape run and persist the updated schedules
+        
+        Args:
+            feed_results (Dict[str, Dict]): Status and articles keyed by feed URL,
+                as collected by RSSFeedScraper.scrape_feeds
+        """
+        for url, result in feed_results.items():
+            if url in self.schedules:
+                self.record_result(url, result['status'], result['articles'])
+        
+        with Database() as db:
+            db.save_feed_schedules([self.schedules[url] for url in feed_results if url in self.schedules])
+
+    def due_sources(self) -> List[Tuple[str, Dict]]:
+        """
+        Get the (country, source) pairs whose next poll time has passed
+        """
+        now = datetime.now().isoformat()
+        return [
+            (country, source)
+            for country, source in self.sources
+            if self.schedules[source['url']]['next_poll'] <= now
+        ]
+
+    def seconds_until_next(self) -> float:
+        """
+        Get the number of seconds until the next feed is due
+        """
+        next_poll = min(
+            datetime.fromisoformat(self.schedules[source['url']]['next_poll'])
+            for _, source in self.sources
+        )
+        return max(0.0, (next_poll - datetime.now()).total_seconds())
@@ -5,25 +5,117 @@ RSS feed scraper module
 import requests
 import time
 import sys
+import codecs
+import threading
+import hashlib
+import math
+import socket
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from langdetect import detect
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from lxml import etree
 from tqdm import tqdm
-from dateutil import parser as date_parser
-from dateutil.tz import tzutc, tzlocal
 import re
 
-from config import RSS_FEEDS, HEADERS, REQUEST_DELAY, MAX_RETRIES
+from config import (
+    RSS_FEEDS, REQUEST_DELAY, MAX_RETRIES,
+    MAX_CONCURRENT_FEEDS, MAX_CONCURRENT_PER_HOST, PARSE_WORKERS, PIPELINE_QUEUE_SIZE,
+    STREAM_PARSING, STREAM_CHUNK_SIZE, MAX_FEED_BYTES, SUMMARY_MAX_LENGTH, ARCHIVE_PAYLOADS,
+    CONNECT_TIMEOUT, FIRST_BYTE_TIMEOUT, FEED_DEADLINE, RUN_TIME_BUDGET, RUN_CANCEL_MARGIN, HEDGE_AFTER
+)
+from database import Database
+from http_session import get_session
+from rate_limiter import get_rate_limiter
+from circuit_breaker import CircuitBreaker
+from feed_parser import FeedItem, choose_encoding, extract_text, item_format, parse_feed_items
+from feed_profile import FeedProfile
+from date_normalizer import DateNormalizer, format_publication_date
+from language_detector import LanguageDetector
+from watermark import FeedWatermark, item_id
+from payload_archive import PayloadArchive
+
+_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# Candidate elements for the publication date and summary, probed in order
+_DATE_FIELDS = ['pubDate', 'published', 'date', 'updated']
+_SUMMARY_FIELDS = ['description', 'summary', 'content', 'content:encoded']
 
 def print_flush(message):
     """Print message and flush immediately for real-time logging"""
     print(message)
     sys.stdout.flush()
 
+def _preempted(item, field: str, candidates: List[str]) -> bool:
+    """Check whether an item has an element that probing tries before the given candidate field"""
+    for candidate in candidates:
+        if candidate == field:
+            return False
+        if item.find(candidate):
+            return True
+    return True  # Not a candidate at all, e.g. a profile stored before the candidates changed
+
+class FeedDeadlineExceeded(Exception):
+    """Raised when a feed download runs past the feed's deadline"""
+
+class FeedDecodeError(Exception):
+    """Raised when a streamed feed turns out not to be in the encoding it is parsed in"""
+
+def _close_response(future: Future):
+    """Close the response of a hedged request that lost the race"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def _abort_download(response: requests.Response):
+    """Shut down the connection of a response still downloading, waking up a read blocked on it"""
+    sock = getattr(getattr(response.raw, 'connection', None), 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Already closed
+
 class RSSFeedScraper:
     def __init__(self):
         self.feeds = RSS_FEEDS
+        self.session = get_session()
+        self.rate_limiter = get_rate_limiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.date_normalizer = DateNormalizer()
+        self.language_detector = LanguageDetector()
+        # Per-host semaphores so concurrent workers never overload a single site
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        # Conditional GET state loaded from / saved to the database on each run. New validators
+        # and body hashes stay pending until the feed's articles are stored, keyed by URL
+        self.feed_states = {}
+        self.pending_states = {}
+        self.updated_states = {}
+        # Encoding that last decoded each feed, keyed by URL
+        self.feed_encodings = {}
+        # High-water marks and item layout profiles of the feeds in the current run, keyed by URL
+        self.watermarks = {}
+        self.profiles = {}
+        self.run_summary = {}
+        # New/duplicate counts of the last stored run and peak pipeline queue depths
+        self.store_summary = {}
+        self.pipeline_stats = {}
+        # Status and articles of each feed scraped in the last run, keyed by URL
+        self.feed_results = {}
+        # Monotonic deadlines of the current run and of the feeds being fetched, keyed by URL
+        self.run_deadline = float('inf')
+        self.feed_deadlines = {}
+        # Feeds cut off at the deadline by the previous run, which go first in this one
+        self.cutoffs = {}
+        self.deadline_stats = {}
+        self._stats_lock = threading.Lock()
+        # Raw payload archive fetched bodies are kept in, opened on the first run when ARCHIVE_PAYLOADS is set
+        self.archive = None
+        self.replay_summary = {}
+        # Processes parsing buffered feeds, started by the first run that needs them and kept for later runs
+        self.parse_pool = None
         # Verify lxml is available
         try:
             BeautifulSoup("<test/>", "lxml-xml")
@@ -33,35 +125,13 @@ class RSSFeedScraper:
                 "Please install it with: pip install lxml"
             ) from e
 
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
+    def _parse_date(self, date_str: str, feed_url: Optional[str] = None) -> Optional[datetime]:
         """
-        Parse date string from RSS feed with multiple fallback formats
+        Parse date string from RSS feed into an aware UTC datetime
+        
+        The format that worked for the feed's previous item is tried first.
         """
-        if not date_str:
-            return None
-            
-        try:
-            # Try standard RSS date parsing first
-            return date_parser.parse(date_str)
-        except Exception:
-            # Try common date formats as fallbacks
-            fallback_formats = [
-                "%a, %d %b %Y %H:%M:%S %Z",  # RFC 2822
-                "%Y-%m-%d %H:%M:%S",         # ISO format
-                "%Y-%m-%dT%H:%M:%S",         # ISO with T
-                "%Y-%m-%d",                  # Date only
-                "%d %b %Y",                  # Simple format
-                "%B %d, %Y"                  # Month Day, Year
-            ]
-            
-            for fmt in fallback_formats:
-                try:
-                    return datetime.strptime(date_str.strip(), fmt)
-                except ValueError:
-                    continue
-            
-            # If all parsing fails, return None
-            return None
+        return self.date_normalizer.parse(date_str, feed_url)
 
     def _extract_text_content(self, element) -> str:
         """
@@ -74,14 +144,8 @@ class RSSFeedScraper:
         if isinstance(element, str):
             return element.strip()
         
-        # Extract text and clean it
-        text = element.get_text() if hasattr(element, 'get_text') else str(element)
-        
-        # Clean up HTML entities and extra whitespace
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        text = re.sub(r'\s+', ' ', text)     # Normalize whitespace
-        text = text.strip()
-        
+        # Extract text, removing HTML tags and normalizing whitespace in one pass
+        text, _ = extract_text(element)
         return text
 
     def _generate_fallback_summary(self, title: str, content: str = "") -> str:
@@ -103,168 +167,1061 @@ class RSSFeedScraper:
         else:
             return f"Article about: {title}"
 
-    def _parse_feed_content(self, content: str, feed_url: str) -> List[Dict]:
+    def _extract_profiled(self, item, feed_url: Optional[str],
+                          profile: FeedProfile) -> Optional[Tuple[datetime, str, str]]:
+        """
+        Extract the publication date, URL and summary of an item from the elements its feed's profile names
+        
+        Items with an element that probing would try first for the date or summary
+        are probed instead, so they get the same fields either way.
+        
+        Returns:
+            Optional[Tuple[datetime, str, str]]: The fields, or None when the item doesn't
+                fit the profile and has to be probed
+        """
+        if _preempted(item, profile.date_field, _DATE_FIELDS) or \
+                _preempted(item, profile.summary_field, _SUMMARY_FIELDS):
+            return None
+        
+        date_elem = item.find(profile.date_field)
+        link_elem = item.find('link')
+        desc_elem = item.find(profile.summary_field)
+        if not (date_elem and link_elem and desc_elem):
+            return None
+        
+        pub_date = self._parse_date(self._extract_text_content(date_elem), feed_url)
+        href = link_elem.get('href')
+        if profile.link_style == 'href':
+            url = href
+        else:
+            url = None if href else self._extract_text_content(link_elem)
+        if not (pub_date and url):
+            return None
+        
+        # Only the part of the summary that survives truncation is read
+        summary, markup = extract_text(desc_elem, SUMMARY_MAX_LENGTH)
+        if markup and not profile.html_summary:
+            return None  # Markup appeared where the profile expects plain text
+        if len(summary) <= 10:
+            return None
+        
+        return pub_date, url, summary
+
+    def _probe_item(self, item, feed_url: Optional[str]) -> Tuple[Tuple[Optional[datetime], str, str], Optional[Tuple]]:
+        """
+        Extract the publication date, URL and summary of an item by probing every candidate element
+        
+        Returns:
+            Tuple: The fields, and the layout (date field, summary field, link style,
+                HTML summary) they were found in, None when some field wasn't found or
+                an earlier candidate element was passed over for being unusable
+        """
+        # Other items of the feed may have a usable element where this one's was passed over
+        passed_over = False
+        
+        # Extract publication date with multiple fallbacks
+        pub_date, date_field = None, None
+        for field in _DATE_FIELDS:
+            date_elem = item.find(field)
+            if date_elem:
+                pub_date = self._parse_date(self._extract_text_content(date_elem), feed_url)
+                if pub_date:
+                    date_field = field
+                    break
+                passed_over = True
+        
+        # Extract URL
+        url, link_style = "", None
+        link_elem = item.find('link')
+        if link_elem:
+            href = link_elem.get('href')
+            url = href or self._extract_text_content(link_elem)
+            if url:
+                link_style = 'href' if href else 'text'
+        
+        # Extract summary/description with fallbacks
+        summary, summary_field, html_summary = "", None, False
+        for field in _SUMMARY_FIELDS:
+            desc_elem = item.find(field)
+            if desc_elem:
+                summary, markup = extract_text(desc_elem, SUMMARY_MAX_LENGTH)
+                if summary and len(summary) > 10:  # Ensure meaningful content
+                    summary_field, html_summary = field, markup
+                    break
+                passed_over = True
+        
+        layout = None
+        if date_field and summary_field and link_style and not passed_over:
+            layout = (date_field, summary_field, link_style, html_summary)
+        return (pub_date, url, summary), layout
+
+    def _parse_item(self, item, current_time: datetime, feed_url: Optional[str] = None,
+                    profile: Optional[FeedProfile] = None) -> Optional[Dict]:
+        """
+        Extract an article from a single RSS item or Atom entry
+        
+        Besides the publication_date string, the article carries the parsed date as
+        an aware UTC datetime in published_at, so storing it needs no re-parse.
+        With a profile, fields are read from the elements the feed is known to use;
+        items that don't fit are probed in full and the profile learns their layout.
+        
+        Returns:
+            Optional[Dict]: Article data, or None for items without a title
+        """
+        # Extract title with fallbacks
+        title_elem = item.find('title')
+        title = self._extract_text_content(title_elem) if title_elem else ""
+        
+        if not title:
+            return None  # Skip items without titles
+        
+        fields = self._extract_profiled(item, feed_url, profile) if profile and profile.known else None
+        if fields is None:
+            fields, layout = self._probe_item(item, feed_url)
+            if profile and layout:
+                profile.learn(*layout)
+        pub_date, url, summary = fields
+        
+        # Fallback: Use current time if no date found
+        if not pub_date:
+            pub_date = current_time
+            print_flush(f"Warning: No publication date found for '{title[:50]}...', using current time")
+        
+        # Fallback: Generate summary if none found
+        if not summary or len(summary) < 10:
+            # Try to get content from link text or title
+            content_text = self._extract_text_content(item)
+            summary = self._generate_fallback_summary(title, content_text)
+        
+        # Limit summary length
+        if len(summary) > SUMMARY_MAX_LENGTH:
+            summary = summary[:SUMMARY_MAX_LENGTH - 3] + "..."
+        
+        return {
+            'title': title,
+            'publication_date': format_publication_date(pub_date),
+            'published_at': pub_date,
+            'summary': summary,
+            'url': url
+        }
+
+    def _parse_new_item(self, item, current_time: datetime, feed_url: str, watermark: Optional[FeedWatermark],
+                        profile: Optional[FeedProfile] = None) -> Tuple[bool, Optional[Dict]]:
+        """
+        Extract an article from an item unless the feed's high-water mark shows it was ingested before
+        
+        Returns:
+            Tuple[bool, Optional[Dict]]: Whether the item was seen before, and its article
+        """
+        identity = item_id(item) if watermark else None
+        if identity is not None and watermark.is_seen(identity):
+            return True, None
+        
+        article = self._parse_item(item, current_time, feed_url, profile)
+        if watermark and article:
+            # Items without GUID or link can only be recognized by their date
+            if identity is None and watermark.is_seen(None, article['published_at']):
+                return True, None
+            watermark.record_new(identity, article['published_at'])
+        
+        return False, article
+
+    def _parse_feed_content(self, content: Union[str, bytes], feed_url: str, use_lxml: bool = True,
+                            watermark: Optional[FeedWatermark] = None, encoding: Optional[str] = None,
+                            profile: Optional[FeedProfile] = None) -> List[Dict]:
         """
         Parse RSS feed content with improved error handling and fallback mechanisms
+        
+        Well-formed RSS 2.0, Atom and RSS 1.0 feeds are read directly with lxml;
+        malformed documents (or use_lxml=False) go through BeautifulSoup. Bytes are
+        decoded with the given encoding, or else as the document declares. With a
+        watermark, parsing stops at the first item that was ingested before; with a
+        profile, items are read through the feed's learned layout.
         """
         articles = []
         
         try:
-            # Parse with lxml-xml parser for better XML handling
-            soup = BeautifulSoup(content, 'lxml-xml')
+            items = parse_feed_items(content, encoding) if use_lxml else None
             
-            # Try different RSS item selectors
-            items = soup.find_all('item')
-            if not items:
-                items = soup.find_all('entry')  # Atom feeds
+            if items is None:
+                # Parse with lxml-xml parser for better XML handling
+                soup = BeautifulSoup(
+                    content, 'lxml-xml', from_encoding=encoding if isinstance(content, bytes) else None
+                )
+                
+                # Try different RSS item selectors
+                items = soup.find_all('item')
+                if not items:
+                    items = soup.find_all('entry')  # Atom feeds
             
             if not items:
                 print_flush(f"Warning: No items found in feed {feed_url}")
                 return articles
             
-            current_time = datetime.now()
+            if profile:
+                profile.check_format(item_format(items[0]))
+            current_time = datetime.now(timezone.utc)
             
-            for item in items:
+            for index, item in enumerate(items):
                 try:
-                    # Extract title with fallbacks
-                    title_elem = item.find('title')
-                    title = self._extract_text_content(title_elem) if title_elem else ""
-                    
-                    if not title:
-                        continue  # Skip items without titles
-                    
-                    # Extract publication date with multiple fallbacks
-                    pub_date = None
-                    date_fields = ['pubDate', 'published', 'date', 'updated']
-                    
-                    for field in date_fields:
-                        date_elem = item.find(field)
-                        if date_elem:
-                            date_str = self._extract_text_content(date_elem)
-                            pub_date = self._parse_date(date_str)
-                            if pub_date:
-                                break
-                    
-                    # Fallback: Use current time if no date found
-                    if not pub_date:
-                        pub_date = current_time
-                        print_flush(f"Warning: No publication date found for '{title[:50]}...', using current time")
-                    
-                    # Convert to string format
-                    pub_date_str = pub_date.strftime("%a, %d %b %Y %H:%M:%S GMT") if pub_date else ""
-                    
-                    # Extract URL
-                    url = ""
-                    link_elem = item.find('link')
-                    if link_elem:
-                        url = link_elem.get('href') or self._extract_text_content(link_elem)
-                    
-                    # Extract summary/description with fallbacks
-                    summary = ""
-                    desc_fields = ['description', 'summary', 'content', 'content:encoded']
-                    
-                    for field in desc_fields:
-                        desc_elem = item.find(field)
-                        if desc_elem:
-                            summary = self._extract_text_content(desc_elem)
-                            if summary and len(summary) > 10:  # Ensure meaningful content
-                                break
-                    
-                    # Fallback: Generate summary if none found
-                    if not summary or len(summary) < 10:
-                        # Try to get content from link text or title
-                        content_text = self._extract_text_content(item)
-                        summary = self._generate_fallback_summary(title, content_text)
-                    
-                    # Limit summary length
-                    if len(summary) > 500:
-                        summary = summary[:497] + "..."
-                    
-                    articles.append({
-                        'title': title,
-                        'publication_date': pub_date_str,
-                        'summary': summary,
-                        'url': url
-                    })
-                    
+                    seen, article = self._parse_new_item(item, current_time, feed_url, watermark, profile)
+                    if seen:
+                        watermark.stop(len(items) - index)
+                        break
+                    if article:
+                        articles.append(article)
+                
                 except Exception as e:
                     print_flush(f"Warning: Error parsing article in {feed_url}: {str(e)}")
                     continue
-            
+        
         except Exception as e:
             print_flush(f"Error parsing feed {feed_url}: {str(e)}")
             return articles
         
         return articles
 
-    def _detect_language(self, text: str) -> str:
+    def _open_feed(self, url: str) -> Tuple[str, Optional[requests.Response]]:
+        """
+        Open a streaming request for a feed with retry mechanism and conditional GET
+        
+        Sends the stored ETag/Last-Modified validators, so a server can answer
+        with 304 instead of resending an unchanged feed. Connect and first-byte
+        timeouts shrink to fit the time left before the feed's deadline, and retries
+        are only made while there is time left for them. An open response only counts
+        as a success for the circuit breaker once its body has been read.
+        
+        Returns:
+            Tuple[str, Optional[requests.Response]]: Status ('open', 'not_modified',
+                'timed_out' or 'failed') and the open response whose body has not been read yet
+        """
+        state = self.feed_states.get(url, {})
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        
+        # A recovering feed gets a single probe instead of the full retry budget
+        max_attempts = 1 if self.circuit_breaker.is_half_open(url) else MAX_RETRIES
+        
+        for attempt in range(max_attempts):
+            self.rate_limiter.wait(url)
+            remaining = self._time_left(url)
+            if remaining <= 0:
+                error = FeedDeadlineExceeded(f"Feed {url} reached its deadline before responding")
+                return self._cut_off(url, error), None
+            
+            try:
+                timeout = (min(CONNECT_TIMEOUT, remaining), min(FIRST_BYTE_TIMEOUT, remaining))
+                response = self._request(url, headers, timeout)
+                if not response.ok:
+                    response.close()
+                response.raise_for_status()
+                break
+            except requests.exceptions.RequestException as e:
+                if self._time_left(url) <= 0:
+                    error = FeedDeadlineExceeded(f"Feed {url} reached its deadline: {str(e)}")
+                    return self._cut_off(url, error), None
+                
+                # Retries are only made while they fit before the feed's deadline
+                delay = REQUEST_DELAY * (attempt + 1)
+                if attempt < max_attempts - 1 and self._time_left(url) > delay:
+                    print_flush(f"Retrying feed {url} after error: {str(e)}")
+                    time.sleep(delay)
+                else:
+                    print_flush(f"Failed to fetch feed {url} after {attempt + 1} retries: {str(e)}")
+                    self.circuit_breaker.record_failure(url, str(e))
+                    return 'failed', None
+        
+        self.pending_states[url] = {
+            'feed_url': url,
+            'etag': response.headers.get('ETag') or state.get('etag'),
+            'last_modified': response.headers.get('Last-Modified') or state.get('last_modified'),
+            'body_hash': state.get('body_hash'),
+            'last_success': datetime.now().isoformat()
+        }
+        
+        # Server confirmed nothing changed since the last fetch
+        if response.status_code == 304:
+            response.close()
+            self.circuit_breaker.record_success(url)
+            return 'not_modified', None
+        
+        return 'open', response
+
+    def _time_left(self, url: Optional[str] = None) -> float:
+        """
+        Get the seconds left before a feed's deadline, or before the run's deadline without a URL
+        """
+        return self.feed_deadlines.get(url, self.run_deadline) - time.monotonic()
+
+    def _count_deadline_stat(self, stat: str):
+        """Increment a hedged request counter"""
+        with self._stats_lock:
+            self.deadline_stats[stat] += 1
+
+    def _request(self, url: str, headers: Dict, timeout: Tuple[float, float]) -> requests.Response:
+        """
+        Send a streaming feed request, hedged with a second one when the first is slow to respond
+        
+        With HEDGE_AFTER set, a request that has no response by then gets a
+        duplicate; the first response is used and the other one is closed.
+        """
+        def send():
+            return self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        
+        if HEDGE_AFTER is None:
+            return send()
+
+        def send_hedge():
+            self.rate_limiter.wait(url)
+            return send()
+        
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            pending = {pool.submit(send)}
+            hedge = None
+            done, _ = wait(pending, timeout=HEDGE_AFTER)
+            if not done and self._time_left(url) > 0:
+                hedge = pool.submit(send_hedge)
+                pending.add(hedge)
+                self._count_deadline_stat('hedged')
+            
+            while True:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                succeeded = [future for future in done if future.exception() is None]
+                if succeeded or not pending:
+                    break
+            
+            for future in pending:
+                future.add_done_callback(_close_response)
+            if not succeeded:
+                raise done.pop().exception()
+            for future in succeeded[1:]:
+                future.result().close()
+            if succeeded[0] is hedge:
+                self._count_deadline_stat('hedge_wins')
+            return succeeded[0].result()
+        finally:
+            pool.shutdown(wait=False)
+
+    def _iter_body(self, response: requests.Response, url: str) -> Iterator[bytes]:
+        """
+        Yield the (decompressed) response body in chunks, truncated at MAX_FEED_BYTES
+        
+        Every byte that arrives restarts the read timeout, so a server trickling its
+        body could hold a read open well past the deadline. A timer shuts the
+        connection down when the deadline passes, which ends any read in progress.
+        
+        Raises:
+            FeedDeadlineExceeded: When the download runs past the feed's deadline
+        """
+        remaining = self._time_left(url)
+        watchdog = None
+        if math.isfinite(remaining):
+            watchdog = threading.Timer(max(0.0, remaining), _abort_download, args=(response,))
+            watchdog.daemon = True
+            watchdog.start()
+        
+        received = 0
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if self._time_left(url) <= 0:
+                    raise FeedDeadlineExceeded(f"Feed {url} reached its deadline while downloading")
+                received += len(chunk)
+                if received > MAX_FEED_BYTES:
+                    print_flush(f"Warning: Feed {url} exceeded {MAX_FEED_BYTES} bytes, truncating")
+                    yield chunk[:len(chunk) - (received - MAX_FEED_BYTES)]
+                    break
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            # A read that timed out past the deadline is a cut-off, not a broken download
+            if self._time_left(url) <= 0:
+                raise FeedDeadlineExceeded(f"Feed {url} reached its deadline while downloading: {str(e)}") from e
+            raise
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            response.close()
+
+    def _is_unchanged(self, url: str, body_hash: str) -> bool:
+        """
+        Record the body hash of a fetched feed and check whether it matches the previous fetch
+        
+        Catches servers that ignore the validators but return the same document.
+        """
+        self.pending_states[url]['body_hash'] = body_hash
+        return body_hash == self.feed_states.get(url, {}).get('body_hash')
+
+    def _cut_off(self, url: str, error: FeedDeadlineExceeded) -> str:
+        """
+        Give up on a feed that reached its deadline, counting it against the feed's circuit
+        
+        Its pending validators and watermark progress are dropped, so the next run
+        downloads it again in full. Feeds that keep stalling past their deadline are
+        quarantined like feeds that keep failing.
+        
+        Returns:
+            str: The 'timed_out' status
+        """
+        print_flush(f"Warning: {str(error)}")
+        self.circuit_breaker.record_failure(url, str(error))
+        self._discard_progress(url)
+        return 'timed_out'
+
+    def _download_failed(self, url: str, error: requests.exceptions.RequestException) -> str:
+        """
+        Give up on a feed whose body broke off mid-download, counting it against the feed's circuit
+        
+        Returns:
+            str: The 'failed' status
+        """
+        print_flush(f"Failed to download feed {url}: {str(error)}")
+        self.circuit_breaker.record_failure(url, str(error))
+        self._discard_progress(url)
+        return 'failed'
+
+    def _commit_progress(self, url: str):
+        """
+        Keep the pending validators and body hash of a feed whose articles were stored
+        
+        Its watermark progress is kept as is and saved with them at the end of the run.
+        """
+        if url in self.pending_states:
+            self.updated_states[url] = self.pending_states.pop(url)
+
+    def _discard_progress(self, url: str):
+        """
+        Drop the pending validators, body hash and watermark progress of a feed whose articles were not stored
+        
+        The next run then sends the previous validators and parses the whole feed again,
+        instead of being told by a 304 or its watermark that the articles were ingested.
+        """
+        self.pending_states.pop(url, None)
+        watermark = self.watermarks.get(url)
+        if watermark:
+            watermark.reset()
+
+    def _http_charset(self, response: requests.Response) -> Optional[str]:
+        """
+        Get the charset the server declared in the Content-Type header, if any
+        
+        Unlike response.encoding, this doesn't default text/* responses to ISO-8859-1.
+        """
+        match = _CHARSET_PATTERN.search(response.headers.get('Content-Type', ''))
+        return match.group(1) if match else None
+
+    def _fetch_feed(self, url: str) -> Tuple[str, Optional[Tuple[bytes, str]]]:
+        """
+        Fetch the full RSS feed content
+        
+        The body is kept as bytes for the XML parser. Its encoding is picked by
+        choose_encoding, starting with the encoding that worked for this feed before.
+        
+        Returns:
+            Tuple[str, Optional[Tuple[bytes, str]]]: Fetch status ('fetched', 'not_modified',
+                'unchanged', 'timed_out' or 'failed') and the feed body and its encoding when it was fetched
+        """
+        status, response = self._open_feed(url)
+        if status != 'open':
+            return status, None
+        
+        try:
+            body = b''.join(self._iter_body(response, url))
+        except FeedDeadlineExceeded as e:
+            return self._cut_off(url, e), None
+        except requests.exceptions.RequestException as e:
+            return self._download_failed(url, e), None
+        
+        self.circuit_breaker.record_success(url)
+        if self._is_unchanged(url, hashlib.sha256(body).hexdigest()):
+            return 'unchanged', None
+        
+        encoding = choose_encoding(body, self.feed_encodings.get(url), self._http_charset(response))
+        self.feed_encodings[url] = encoding
+        if self.archive:
+            self.archive.put('live', url, body, encoding)
+        return 'fetched', (body, encoding)
+
+    def _iter_stream_articles(self, response: requests.Response, url: str, hasher, chunks: List[bytes],
+                              watermark: Optional[FeedWatermark] = None) -> Iterator[Dict]:
+        """
+        Parse a feed incrementally while it downloads, yielding articles as soon as
+        each item is complete
+        
+        Every chunk is fed to an lxml pull parser, added to the body hash and
+        collected in chunks. Parsed items are dropped from the tree right away, so
+        memory stays bounded by the raw body plus the largest single item rather than
+        the whole document tree. The encoding is picked by choose_encoding from the
+        first chunk, and every chunk is checked to decode in it. With a watermark,
+        the download is abandoned at the first item that was ingested before.
+        
+        Raises:
+            FeedDecodeError: When a chunk doesn't decode in the picked encoding; the
+                rest of the body has been downloaded into chunks by then
+        """
+        profile = self.profiles.get(url)
+        current_time = datetime.now(timezone.utc)
+        item_tag = None
+        parser = decoder = None
+
+        def read_items():
+            nonlocal item_tag
+            for _, elem in parser.read_events():
+                tag = etree.QName(elem).localname
+                # Like the buffered parser, RSS items take precedence over Atom entries
+                if item_tag is None:
+                    item_tag = tag
+                    if profile:
+                        profile.check_format(item_format(FeedItem(elem)))
+                if tag == item_tag:
+                    try:
+                        seen, article = self._parse_new_item(FeedItem(elem), current_time, url, watermark, profile)
+                        if seen:
+                            watermark.stop()  # The rest is never downloaded, so it can't be counted
+                            return
+                        if article:
+                            yield article
+                    except Exception as e:
+                        print_flush(f"Warning: Error parsing article in {url}: {str(e)}")
+                
+                # Free the processed item and everything before it
+                elem.clear()
+                parent = elem.getparent()
+                while parent is not None and elem.getprevious() is not None:
+                    del parent[0]
+        
+        body = self._iter_body(response, url)
+        try:
+            for chunk in body:
+                hasher.update(chunk)
+                chunks.append(chunk)
+                if parser is None:
+                    # Bytes are decoded as the BOM, XML declaration or HTTP charset say,
+                    # unless another encoding worked for the feed before
+                    encoding = choose_encoding(
+                        chunk, self.feed_encodings.get(url), self._http_charset(response), complete=False
+                    )
+                    self.feed_encodings[url] = encoding
+                    parser = etree.XMLPullParser(
+                        events=('end',), tag=('{*}item', '{*}entry'), recover=True, encoding=encoding
+                    )
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                
+                try:
+                    decoder.decode(chunk)
+                except UnicodeDecodeError as e:
+                    # The pull parser would replace what it can't decode, so keep the rest for a second parse
+                    for rest in body:
+                        hasher.update(rest)
+                        chunks.append(rest)
+                    raise FeedDecodeError(f"Feed {url} does not decode as {encoding}") from e
+                parser.feed(chunk)
+                yield from read_items()
+                if watermark and watermark.stopped_early:
+                    return  # Closing the body below drops the rest of the download
+            if parser is not None:
+                parser.close()
+        except etree.XMLSyntaxError as e:
+            print_flush(f"Error parsing feed {url}: {str(e)}")
+        finally:
+            body.close()
+        
+        if parser is not None:
+            yield from read_items()
+        
+        if item_tag is None:
+            print_flush(f"Warning: No items found in feed {url}")
+
+    def _stream_feed(self, url: str) -> Tuple[str, List[Dict]]:
         """
-        Detect language of the text with fallback
+        Fetch and parse a feed in a single streaming pass
+        
+        Articles parsed before the download fails or reaches its deadline are
+        discarded along with their watermark progress, so the next run ingests them again.
+        A feed that doesn't decode in the encoding picked from its first chunk is parsed
+        again in full, in the encoding choose_encoding picks for the whole body.
+        
+        Returns:
+            Tuple[str, List[Dict]]: Fetch status and the articles found in the feed
         """
+        status, response = self._open_feed(url)
+        if status != 'open':
+            return status, []
+        
+        hasher = hashlib.sha256()
+        watermark = self.watermarks.get(url)
+        chunks = []
+        misdecoded = False
         try:
-            if text and len(text.strip()) > 10:
-                return detect(text)
+            articles = list(self._iter_stream_articles(response, url, hasher, chunks, watermark))
+        except FeedDecodeError as e:
+            print_flush(f"Warning: {str(e)}, parsing it again")
+            if watermark:
+                watermark.reset()
+            articles, misdecoded = [], True
+        except FeedDeadlineExceeded as e:
+            return self._cut_off(url, e), []
+        except requests.exceptions.RequestException as e:
+            return self._download_failed(url, e), []
         except Exception:
-            pass
-        return "en"  # Default to English
+            self._discard_progress(url)
+            raise
+        
+        self.circuit_breaker.record_success(url)
+        # A partial download has no meaningful body hash, so keep the stored one
+        partial = bool(watermark and watermark.stopped_early)
+        if partial:
+            status = 'fetched' if articles else 'unchanged'
+        elif self._is_unchanged(url, hasher.hexdigest()):
+            return 'unchanged', []
+        else:
+            status = 'fetched'
+        
+        if misdecoded:
+            body = b''.join(chunks)
+            encoding = choose_encoding(body, http_charset=self._http_charset(response))
+            self.feed_encodings[url] = encoding
+            articles = self._parse_feed_content(
+                body, url, watermark=watermark, encoding=encoding, profile=self.profiles.get(url)
+            )
+        
+        if self.archive and status == 'fetched':
+            self.archive.put(
+                'live', url, b''.join(chunks), self.feed_encodings.get(url), complete=not partial
+            )
+        return status, articles if status == 'fetched' else []
 
-    def _fetch_feed(self, url: str) -> Optional[str]:
+    def _host_semaphore(self, url: str) -> threading.Semaphore:
         """
-        Fetch RSS feed content with retry mechanism
+        Get (or create) the semaphore limiting concurrent requests to the url's host
         """
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.get(url, headers=HEADERS, timeout=30)
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                if attempt < MAX_RETRIES - 1:
-                    print_flush(f"Retrying feed {url} after error: {str(e)}")
-                    time.sleep(REQUEST_DELAY * (attempt + 1))
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(MAX_CONCURRENT_PER_HOST)
+            return self._host_semaphores[host]
+
+    def _fetch_source(self, source: Dict, stream: bool = False) -> Tuple[str, object]:
+        """
+        Fetch a single feed while holding a slot for its host
+        
+        Args:
+            source (Dict): Feed configuration
+            stream (bool): Parse the feed while it downloads and return its articles
+                instead of the raw content
+        
+        Returns:
+            Tuple[str, object]: Fetch status ('quarantined' when the feed was skipped,
+                'cancelled' when the run was nearly out of time) and the feed body and
+                encoding (parsed articles when streaming), None unless fetched
+        """
+        # Skip feeds quarantined by the circuit breaker
+        if not self.circuit_breaker.allow(source['url']):
+            print_flush(f"Skipping quarantined feed {source['name']} ({source['url']})")
+            return 'quarantined', None
+        
+        with self._host_semaphore(source['url']):
+            # Feeds that would start too close to the end of the run's budget are left for the next run
+            if self._time_left() < RUN_CANCEL_MARGIN:
+                print_flush(f"Cancelling feed {source['name']}: run time budget nearly used up")
+                return 'cancelled', None
+            self.feed_deadlines[source['url']] = min(time.monotonic() + FEED_DEADLINE, self.run_deadline)
+            
+            if stream:
+                status, payload = self._stream_feed(source['url'])
+            else:
+                status, payload = self._fetch_feed(source['url'])
+        
+        if status in ('not_modified', 'unchanged'):
+            print_flush(f"No changes in {source['name']} since last fetch ({status})")
+        
+        return status, payload if status == 'fetched' else None
+
+    def _enrich_articles(self, country: str, source: Dict, articles: List[Dict]) -> List[Dict]:
+        """
+        Add source metadata and language tags to the parsed articles of a feed
+        """
+        for article in articles:
+            article['source'] = source['name']
+            article['country'] = country
+        
+        # The configured language of the source is the prior for text in its script
+        self.language_detector.tag_articles(articles, prior=source.get('language'))
+        
+        print_flush(f"Found {len(articles)} new articles from {source['name']}")
+        return articles
+
+    def _scrape_source(self, country: str, source: Dict) -> Tuple[str, List[Dict]]:
+        """
+        Fetch, parse and tag the articles of a single feed in the calling thread
+        
+        Returns:
+            Tuple[str, List[Dict]]: Fetch status and the articles found in the feed
+        """
+        status, payload = self._fetch_source(source, stream=STREAM_PARSING)
+        if status != 'fetched':
+            return status, []
+        
+        return status, self._parse_fetched(country, source, payload)
+
+    def _parse_fetched(self, country: str, source: Dict, payload: object) -> List[Dict]:
+        """
+        Parse (unless it was streamed) and tag a fetched feed in this process
+        
+        Args:
+            payload (object): Articles parsed while streaming, else the feed body and its encoding
+        """
+        if STREAM_PARSING:
+            articles = payload
+        else:
+            body, encoding = payload
+            articles = self._parse_feed_content(
+                body, source['url'], watermark=self.watermarks.get(source['url']), encoding=encoding,
+                profile=self.profiles.get(source['url'])
+            )
+        return self._enrich_articles(country, source, articles)
+
+    def all_sources(self) -> List[Tuple[str, Dict]]:
+        """
+        Get every configured feed as a (country, source) pair
+        """
+        return [
+            (country, source)
+            for country, country_sources in self.feeds.items()
+            for source in country_sources
+        ]
+
+    def _fetch_stage(self, index: int, country: str, source: Dict, parse_queue: queue.Queue):
+        """
+        Fetch a feed and hand it to the parse stage
+        
+        With STREAM_PARSING the feed is parsed and tagged here while it downloads, which
+        lets the download stop at the first item ingested before; so is a buffered feed
+        when PARSE_WORKERS is 0. The parse stage then only passes the articles on.
+        """
+        try:
+            if PARSE_WORKERS > 0 and not STREAM_PARSING:
+                status, payload = self._fetch_source(source)
+            else:
+                status, payload = self._scrape_source(country, source)
+        except Exception as e:
+            print_flush(f"Error scraping feed {source['url']}: {str(e)}")
+            status, payload = 'failed', None
+        
+        # Blocks while the parse stage is behind
+        parse_queue.put((index, status, payload))
+
+    def _store_stage(self, sources: List[Tuple[str, Dict]], results: List[List[Dict]],
+                     parse_queue: queue.Queue, store_queue: queue.Queue, pbar: tqdm, store: bool):
+        """
+        Collect parsed feeds in order of completion, storing their articles when requested
+        
+        Runs in a single writer thread, so only one database connection is ever used.
+        Pending validators and watermark progress of a feed are kept once its articles
+        are stored, and dropped when it failed to fetch, parse or store.
+        """
+        db = Database() if store else None
+        try:
+            while True:
+                entry = store_queue.get()
+                if entry is None:
+                    break
+                
+                index, status, payload = entry
+                country, source = sources[index]
+                pbar.set_description(f"Processed feed: {source['name']} ({source['url']})")
+                self._record_queue_depths(parse_queue, store_queue, pbar)
+                
+                try:
+                    if isinstance(payload, Future):
+                        # Parse workers update copies of the watermark and profile and send them back
+                        articles, self.watermarks[source['url']], self.profiles[source['url']] = payload.result()
+                    else:
+                        articles = payload or []
+                except Exception as e:
+                    print_flush(f"Error parsing feed {source['url']}: {str(e)}")
+                    status, articles = 'failed', []
+                
+                if db is not None and not self._store_articles(db, articles):
+                    status = 'failed'
+                if status in ('fetched', 'not_modified', 'unchanged'):
+                    self._commit_progress(source['url'])
                 else:
-                    print_flush(f"Failed to fetch feed {url} after {MAX_RETRIES} retries: {str(e)}")
-                    return None
-        return None
+                    self._discard_progress(source['url'])
+                
+                watermark = self.watermarks.get(source['url'])
+                results[index] = articles
+                self.run_summary[status] += 1
+                self.feed_results[source['url']] = {
+                    'status': status,
+                    'articles': articles,
+                    'new': len(articles),
+                    'skipped': watermark.skipped if watermark else 0
+                }
+                
+                pbar.update(1)
+        finally:
+            if db is not None:
+                db.close()
 
-    def scrape_feeds(self) -> List[Dict]:
+    def _store_articles(self, db: Database, articles: List[Dict]) -> bool:
         """
-        Scrape all RSS feeds and return list of articles
+        Insert articles into the database, counting new ones and duplicates in store_summary
+        
+        Returns:
+            bool: Whether the articles were stored
         """
-        all_articles = []
+        try:
+            counts = db.insert_articles(articles)
+        except Exception as e:
+            print_flush(f"Error saving {len(articles)} articles: {str(e)}")
+            return False
         
-        # Count total feeds for progress bar
-        total_feeds = sum(len(sources) for sources in self.feeds.values())
+        self.store_summary['new'] += counts['inserted']
+        self.store_summary['duplicates'] += counts['duplicates']
+        if counts['failed']:
+            print_flush(f"Skipped {counts['failed']} articles with missing or invalid fields")
+        return True
+
+    def _get_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Get the parse worker processes, starting them on first use
         
-        with tqdm(total=total_feeds, desc="Scraping feeds") as pbar:
-            for country, sources in self.feeds.items():
-                for source in sources:
-                    pbar.set_description(f"Processing feed: {source['name']} ({source['url']})")
-                    
-                    # Fetch feed content
-                    content = self._fetch_feed(source['url'])
-                    if not content:
-                        pbar.update(1)
-                        continue
-                    
-                    # Parse articles
-                    articles = self._parse_feed_content(content, source['url'])
-                    
-                    # Add metadata to articles
-                    for article in articles:
-                        article['source'] = source['name']
-                        article['country'] = country
-                        
-                        # Detect language if not specified or use fallback
-                        if 'language' in source:
-                            article['language'] = source['language']
-                        else:
-                            article['language'] = self._detect_language(article['title'] + " " + article['summary'])
-                    
-                    all_articles.extend(articles)
-                    print_flush(f"Found {len(articles)} new articles from {source['name']}")
+        Returns:
+            Optional[ProcessPoolExecutor]: The pool, or None when feeds are parsed in the
+                fetch threads (STREAM_PARSING, or PARSE_WORKERS set to 0)
+        """
+        if PARSE_WORKERS <= 0 or STREAM_PARSING:
+            return None
+        if self.parse_pool is None:
+            # Spawned workers don't inherit locks held by the fetch threads
+            self.parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self.parse_pool
+
+    def close(self):
+        """
+        Stop the parse worker processes kept between runs
+        """
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+
+    def _record_queue_depths(self, parse_queue: queue.Queue, store_queue: queue.Queue, pbar: tqdm):
+        """
+        Show the current depth of the pipeline queues and remember the peaks
+        """
+        depths = {'parse_queue': parse_queue.qsize(), 'store_queue': store_queue.qsize()}
+        for name, depth in depths.items():
+            self.pipeline_stats[f"{name}_peak"] = max(self.pipeline_stats[f"{name}_peak"], depth)
+        pbar.set_postfix(depths, refresh=False)
+
+    def scrape_feeds(self, sources: Optional[List[Tuple[str, Dict]]] = None, store: bool = False) -> List[Dict]:
+        """
+        Scrape RSS feeds through a staged pipeline and return list of articles
+        
+        Up to MAX_CONCURRENT_FEEDS threads fetch feeds, with at most
+        MAX_CONCURRENT_PER_HOST requests in flight per host; with STREAM_PARSING they
+        parse and tag each feed while it downloads. Otherwise a pool of PARSE_WORKERS
+        processes, kept across runs until close(), parses and tags the fetched feeds.
+        A single writer thread collects (and optionally stores) the results. Stages are connected by queues
+        holding at most PIPELINE_QUEUE_SIZE feeds, so a slow stage holds back the
+        one before it. Articles are returned in the same order as the feeds appear
+        in the configuration.
+        
+        The run gets RUN_TIME_BUDGET seconds and each feed FEED_DEADLINE seconds.
+        Feeds still downloading at their deadline are timed out, and feeds not started
+        by the last RUN_CANCEL_MARGIN seconds of the budget are cancelled; both are
+        recorded and fetched first by the next run.
+        
+        Args:
+            sources (List[Tuple[str, Dict]], optional): (country, source) pairs to scrape,
+                defaults to every configured feed
+            store (bool): Insert the articles into the database as they are parsed
+        """
+        if sources is None:
+            sources = self.all_sources()
+        results = [[] for _ in sources]
+        self.feed_results = {}
+        self.run_summary = {
+            'fetched': 0, 'not_modified': 0, 'unchanged': 0, 'failed': 0, 'quarantined': 0,
+            'timed_out': 0, 'cancelled': 0
+        }
+        self.store_summary = {'new': 0, 'duplicates': 0}
+        parse_pool = self._get_parse_pool()
+        self.pipeline_stats = {
+            'parse_workers': PARSE_WORKERS if parse_pool else 0, 'parse_queue_peak': 0, 'store_queue_peak': 0
+        }
+        self.deadline_stats = {'hedged': 0, 'hedge_wins': 0}
+        self.run_deadline = time.monotonic() + RUN_TIME_BUDGET if RUN_TIME_BUDGET else float('inf')
+        self.feed_deadlines = {}
+        
+        # Load validators, body hashes, high-water marks, profiles, cut-off feeds and circuit breaker state from previous runs
+        with Database() as db:
+            self.feed_states = db.get_feed_states()
+            stored_watermarks = db.get_feed_watermarks()
+            stored_profiles = db.get_feed_profiles()
+            self.cutoffs = db.get_feed_cutoffs()
+        self.watermarks = {
+            source['url']: FeedWatermark.from_stored(source['url'], stored_watermarks.get(source['url']))
+            for _, source in sources
+        }
+        self.profiles = {
+            source['url']: FeedProfile.from_stored(source['url'], stored_profiles.get(source['url']))
+            for _, source in sources
+        }
+        self.pending_states = {}
+        self.updated_states = {}
+        self.circuit_breaker.load()
+        if ARCHIVE_PAYLOADS and self.archive is None:
+            self.archive = PayloadArchive()
+        
+        parse_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        store_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        with tqdm(total=len(sources), desc="Scraping feeds") as pbar:
+            writer = threading.Thread(
+                target=self._store_stage,
+                args=(sources, results, parse_queue, store_queue, pbar, store)
+            )
+            writer.start()
+            
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENT_FEEDS)) as fetchers:
+                    # Feeds cut off by the previous run go first; results keep the configured order
+                    order = sorted(range(len(sources)), key=lambda i: sources[i][1]['url'] not in self.cutoffs)
+                    for index in order:
+                        country, source = sources[index]
+                        fetchers.submit(self._fetch_stage, index, country, source, parse_queue)
                     
-                    # Rate limiting
-                    time.sleep(REQUEST_DELAY)
-                    pbar.update(1)
+                    # Parse stage: hand fetched content to the process pool, or pass parsed articles on.
+                    # Futures wait in the bounded store queue, which caps the feeds being parsed at once.
+                    for _ in sources:
+                        index, status, payload = parse_queue.get()
+                        if status == 'fetched' and parse_pool is not None:
+                            country, source = sources[index]
+                            try:
+                                payload = parse_pool.submit(
+                                    _parse_in_worker, payload, country, source,
+                                    self.watermarks.get(source['url']), self.profiles.get(source['url'])
+                                )
+                            except Exception as e:
+                                # A crashed worker breaks the pool; parse the rest here and start anew next run
+                                print_flush(f"Parse workers unavailable, parsing in-process: {str(e)}")
+                                parse_pool.shutdown(wait=False)
+                                parse_pool = self.parse_pool = None
+                                payload = self._parse_fetched(country, source, payload)
+                        store_queue.put((index, status, payload))
+            finally:
+                store_queue.put(None)
+                writer.join()
+        
+        # Persist fetch state, high-water marks, learned profiles and cut-off feeds for the next run
+        changed_watermarks = [watermark.to_stored() for watermark in self.watermarks.values() if watermark.changed]
+        changed_profiles = [
+            profile.to_stored() for profile in self.profiles.values() if profile.changed and profile.known
+        ]
+        cut_at = datetime.now().isoformat()
+        cutoffs = [
+            {'feed_url': url, 'status': result['status'], 'cut_at': cut_at}
+            for url, result in self.feed_results.items()
+            if result['status'] in ('timed_out', 'cancelled')
+        ]
+        completed = [
+            url for url, result in self.feed_results.items()
+            if url in self.cutoffs and result['status'] not in ('timed_out', 'cancelled')
+        ]
+        if self.updated_states or changed_watermarks or changed_profiles or cutoffs or completed:
+            with Database() as db:
+                db.save_feed_states(list(self.updated_states.values()))
+                db.save_feed_watermarks(changed_watermarks)
+                db.save_feed_profiles(changed_profiles)
+                db.save_feed_cutoffs(cutoffs, completed)
+        self.circuit_breaker.save()
         
-        return all_articles 
\ No newline at end of file
+        all_articles = []
+        for articles in results:
+            all_articles.extend(articles)
+        
+        return all_articles
+
+    def replay_archive(self, archive: PayloadArchive, store: bool = False) -> List[Dict]:
+        """
+        Parse archived feed bodies again, without any network access
+        
+        Payloads are replayed in fetch order through the same parsing and tagging as
+        fetched feeds, in this process so timings are repeatable. High-water marks are
+        not applied, so every archived item is parsed again; when storing, articles
+        already in the database count as duplicates. Payloads of feeds that are no
+        longer configured are skipped.
+        
+        Args:
+            archive (PayloadArchive): Archive to replay
+            store (bool): Insert the articles into the database
+        
+        Returns:
+            List[Dict]: Articles of every replayed payload
+        """
+        sources_by_url = {source['url']: (country, source) for country, source in self.all_sources()}
+        self.store_summary = {'new': 0, 'duplicates': 0}
+        self.replay_summary = {'payloads': 0, 'skipped': 0}
+        profiles = {}
+        all_articles = []
+        
+        db = Database() if store else None
+        try:
+            for entry in tqdm(archive.entries('live'), desc="Replaying archived feeds"):
+                url = entry['feed_url']
+                body = archive.read(entry) if url in sources_by_url else None
+                if body is None:
+                    print_flush(f"Skipping archived payload {entry['id']} of {url}")
+                    self.replay_summary['skipped'] += 1
+                    continue
+                
+                country, source = sources_by_url[url]
+                profile = profiles.setdefault(url, FeedProfile(url))
+                articles = self._enrich_articles(
+                    country, source,
+                    self._parse_feed_content(body, url, encoding=entry['encoding'], profile=profile)
+                )
+                self.replay_summary['payloads'] += 1
+                all_articles.extend(articles)
+                if db is not None:
+                    self._store_articles(db, articles)
+        finally:
+            if db is not None:
+                db.close()
+        
+        return all_articles
+
+# Scraper used by the parse stage inside each worker process
+_worker_scraper = None
+
+def _get_worker_scraper() -> RSSFeedScraper:
+    """Get this worker process's scraper, creating it on first use"""
+    global _worker_scraper
+    if _worker_scraper is None:
+        _worker_scraper = RSSFeedScraper()
+    return _worker_scraper
+
+def _parse_in_worker(payload: Tuple[bytes, str], country: str, source: Dict, watermark: Optional[FeedWatermark],
+                     profile: Optional[FeedProfile]) -> Tuple[List[Dict], Optional[FeedWatermark], Optional[FeedProfile]]:
+    """
+    Parse and tag the new items of a fetched feed in a parse worker process
+    
+    Args:
+        payload (Tuple[bytes, str]): Feed body and its encoding
+    
+    Returns:
+        Tuple[List[Dict], Optional[FeedWatermark], Optional[FeedProfile]]: Articles, the
+            advanced watermark and the (re)learned profile
+    """
+    worker_scraper = _get_worker_scraper()
+    body, encoding = payload
+    articles = worker_scraper._parse_feed_content(
+        body, source['url'], watermark=watermark, encoding=encoding, profile=profile
+    )
+    return worker_scraper._enrich_articles(country, source, articles), watermark, profile
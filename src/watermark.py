@@ -0,0 +1,109 @@
+"""
+Per-feed high-water marks used to ingest only items that weren't seen before
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import WATERMARK_RECENT_IDS
+
+def item_id(item) -> Optional[str]:
+    """
+    Get the identity of a feed item: its GUID (RSS guid or Atom id), else its link
+    
+    Works on both BeautifulSoup tags and FeedItem wrappers.
+    """
+    for name in ('guid', 'id'):
+        elem = item.find(name)
+        if elem:
+            text = elem.get_text().strip()
+            if text:
+                return text
+    
+    link = item.find('link')
+    if link:
+        return (link.get('href') or link.get_text()).strip() or None
+    return None
+
+class FeedWatermark:
+    """
+    Newest publication date and recently ingested item ids of a feed
+    
+    Feeds list their items newest first, so parsing can stop at the first item
+    that was ingested before. Items are recognized by their GUID or link; items
+    with neither are compared by publication date instead. Besides the stored
+    mark, an instance counts the new and skipped items of the current run; the
+    skipped count is None when a download stopped before the rest could be counted.
+    """
+
+    def __init__(self, feed_url: str, last_published: Optional[str] = None,
+                 recent_ids: Optional[List[str]] = None):
+        self.feed_url = feed_url
+        self.stored_last_published = datetime.fromisoformat(last_published) if last_published else None
+        self.recent_ids = recent_ids or []
+        self.reset()
+
+    def reset(self):
+        """Forget the progress of the current run, for when its articles are discarded"""
+        self.last_published = self.stored_last_published
+        self._seen = set(self.recent_ids)
+        self.new_ids = []
+        self.new_count = 0
+        self.skipped = 0
+        self.stopped_early = False
+
+    @classmethod
+    def from_stored(cls, feed_url: str, stored: Optional[Dict]) -> 'FeedWatermark':
+        """Create a feed's watermark from its database row, or an empty one"""
+        if not stored:
+            return cls(feed_url)
+        return cls(feed_url, stored['last_published'], stored['recent_ids'])
+
+    def is_seen(self, identity: Optional[str], published: Optional[datetime] = None) -> bool:
+        """
+        Check whether an item was ingested before
+        
+        Args:
+            identity (str, optional): GUID or link of the item
+            published (datetime, optional): Publication date, used when the item has no identity
+        """
+        if identity is not None:
+            return identity in self._seen
+        if published is not None and self.last_published is not None:
+            return published <= self.last_published
+        return False
+
+    def record_new(self, identity: Optional[str], published: Optional[datetime]):
+        """Remember a newly ingested item"""
+        self.new_count += 1
+        if identity is not None and identity not in self._seen:
+            self._seen.add(identity)
+            self.new_ids.append(identity)
+        if published is not None and (self.last_published is None or published > self.last_published):
+            self.last_published = published
+
+    def stop(self, skipped: Optional[int] = None):
+        """
+        Record that ingestion stopped at an item seen before
+        
+        Args:
+            skipped (int, optional): Items left unparsed from that one on, None when
+                the rest of the feed was never downloaded and can't be counted
+        """
+        self.stopped_early = True
+        self.skipped = skipped
+
+    @property
+    def changed(self) -> bool:
+        """Whether the current run ingested anything that moves the mark"""
+        return self.new_count > 0
+
+    def to_stored(self) -> Dict:
+        """
+        Get the updated mark for the database, keeping the WATERMARK_RECENT_IDS newest ids
+        """
+        return {
+            'feed_url': self.feed_url,
+            'last_published': self.last_published.isoformat() if self.last_published else None,
+            'recent_ids': (self.new_ids + self.recent_ids)[:WATERMARK_RECENT_IDS]
+        }
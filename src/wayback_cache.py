@@ -0,0 +1,165 @@
+"""
+Persistent on-disk cache for Wayback Machine CDX results and snapshots
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import WAYBACK_CACHE_DIR, WAYBACK_CACHE_MAX_MB, WAYBACK_CDX_TTL
+
+class WaybackCache:
+    """
+    Gzip-compressed file cache keyed by the SHA-256 of the request
+    
+    CDX responses expire after WAYBACK_CDX_TTL hours because new snapshots keep
+    being archived; snapshot bodies never change and only leave the cache through
+    eviction. A file's modification time doubles as its last-use time, and the
+    least recently used files are evicted once the cache exceeds WAYBACK_CACHE_MAX_MB.
+    """
+
+    def __init__(self, cache_dir: str = WAYBACK_CACHE_DIR, max_mb: float = WAYBACK_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.stats = {
+            'cdx_hits': 0, 'cdx_misses': 0,
+            'snapshot_hits': 0, 'snapshot_misses': 0,
+            'evictions': 0
+        }
+        
+        for kind in ('cdx', 'snapshots'):
+            os.makedirs(os.path.join(cache_dir, kind), exist_ok=True)
+        self.total_bytes = sum(os.path.getsize(path) for path in self._files())
+
+    def _files(self) -> List[str]:
+        """List every cached file"""
+        paths = []
+        for kind in ('cdx', 'snapshots'):
+            directory = os.path.join(self.cache_dir, kind)
+            paths.extend(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.gz'))
+        return paths
+
+    def _path(self, kind: str, key: str) -> str:
+        """Get the file path of a cache key"""
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, kind, f"{digest}.gz")
+
+    def _read(self, path: str) -> Optional[bytes]:
+        """Read and decompress a cached file, marking it as recently used"""
+        try:
+            with gzip.open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except (OSError, EOFError):
+            return None
+
+    def _write(self, path: str, data: bytes):
+        """Compress and atomically write a cache file, evicting old entries when over the size cap"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(data)
+        
+        with self.lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.total_bytes += os.path.getsize(path) - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until the cache is back under 90% of its cap"""
+        entries = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+        
+        self.total_bytes = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def _count(self, stat: str):
+        """Increment a hit/miss counter"""
+        with self.lock:
+            self.stats[stat] += 1
+
+    @staticmethod
+    def _cdx_key(params: Dict) -> str:
+        """Build a stable cache key from CDX query parameters"""
+        return json.dumps(params, sort_keys=True)
+
+    def get_cdx(self, params: Dict) -> Optional[list]:
+        """
+        Get a cached CDX response that is younger than WAYBACK_CDX_TTL
+        
+        Args:
+            params (Dict): CDX query parameters
+        
+        Returns:
+            Optional[list]: Decoded CDX rows, or None on a miss
+        """
+        data = self._read(self._path('cdx', self._cdx_key(params)))
+        if data is not None:
+            entry = json.loads(data)
+            if time.time() - entry['fetched_at'] < WAYBACK_CDX_TTL * 3600:
+                self._count('cdx_hits')
+                return entry['rows']
+        
+        self._count('cdx_misses')
+        return None
+
+    def put_cdx(self, params: Dict, rows: list):
+        """Store a decoded CDX response"""
+        entry = {'fetched_at': time.time(), 'rows': rows}
+        self._write(self._path('cdx', self._cdx_key(params)), json.dumps(entry).encode('utf-8'))
+
+    @staticmethod
+    def _snapshot_key(wayback_url: str) -> str:
+        """Build the cache key of a raw snapshot body (entries decoded to text used the bare URL)"""
+        return f"raw:{wayback_url}"
+
+    def get_snapshot(self, wayback_url: str) -> Optional[bytes]:
+        """
+        Get a cached snapshot body
+        
+        Args:
+            wayback_url (str): Snapshot URL, which includes its timestamp and original URL
+        
+        Returns:
+            Optional[bytes]: Raw snapshot content, or None on a miss
+        """
+        data = self._read(self._path('snapshots', self._snapshot_key(wayback_url)))
+        if data is not None:
+            self._count('snapshot_hits')
+            return data
+        
+        self._count('snapshot_misses')
+        return None
+
+    def put_snapshot(self, wayback_url: str, content: bytes):
+        """Store a raw snapshot body"""
+        self._write(self._path('snapshots', self._snapshot_key(wayback_url)), content)
+
+    def summary(self) -> str:
+        """Describe the hit/miss counters for logging"""
+        return (
+            f"Wayback cache: CDX {self.stats['cdx_hits']} hits / {self.stats['cdx_misses']} misses, "
+            f"snapshots {self.stats['snapshot_hits']} hits / {self.stats['snapshot_misses']} misses, "
+            f"{self.stats['evictions']} evictions, {self.total_bytes / (1024 * 1024):.1f} MB on disk"
+        )
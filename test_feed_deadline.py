@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for feed deadlines against a server that trickles its body
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import http.server
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import config
+
+FEED_DEADLINE = 3
+TRICKLE_BYTES = 10      # Bytes sent per write
+TRICKLE_INTERVAL = 0.1  # Seconds between writes, well under the read timeout
+
+class TrickleHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a feed a few bytes at a time, so no single read ever times out"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'<?xml version="1.0"?><rss version="2.0"><channel><title>Slow</title>' + b' ' * 5000 + b'</channel></rss>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            for start in range(0, len(body), TRICKLE_BYTES):
+                self.wfile.write(body[start:start + TRICKLE_BYTES])
+                self.wfile.flush()
+                time.sleep(TRICKLE_INTERVAL)
+        except OSError:
+            pass  # The scraper hung up
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    print("🕒 Testing feed deadlines against a trickling server")
+    print("=" * 50)
+    
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), TrickleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/feed"
+    
+    # Keep the test's database and bookkeeping away from data/news.db
+    os.chdir(tempfile.mkdtemp())
+    os.makedirs("data", exist_ok=True)
+    config.RSS_FEEDS.clear()
+    config.RSS_FEEDS['Test'] = [{'name': 'Trickle', 'url': url, 'language': 'en'}]
+    
+    import scraper
+    scraper.FEED_DEADLINE = FEED_DEADLINE
+    scraper.PARSE_WORKERS = 0
+    
+    failures = 0
+    for stream in (True, False):
+        scraper.STREAM_PARSING = stream
+        feed_scraper = scraper.RSSFeedScraper()
+        start = time.monotonic()
+        feed_scraper.scrape_feeds()
+        elapsed = time.monotonic() - start
+        status = feed_scraper.feed_results[url]['status']
+        
+        mode = "streaming" if stream else "buffered"
+        # The whole body would take 50s to arrive; a second of slack covers the rate limiter and setup
+        if status == 'timed_out' and elapsed < FEED_DEADLINE + 1:
+            print(f"✅ {mode}: timed out after {elapsed:.1f}s (deadline {FEED_DEADLINE}s)")
+        else:
+            print(f"❌ {mode}: {status} after {elapsed:.1f}s (deadline {FEED_DEADLINE}s)")
+            failures += 1
+    
+    server.shutdown()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
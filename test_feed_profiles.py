@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for feed profiles against a feed whose items use different elements
+"""
+
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from feed_profile import FeedProfile
+from scraper import RSSFeedScraper
+
+FEED_URL = "http://example.com/mixed.xml"
+
+# The first item teaches the profile content:encoded and updated; later items carry
+# elements that probing prefers, or a preferred element too short to be used
+MIXED_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+<title>Mixed</title>
+<item>
+  <title>Only encoded content</title>
+  <link>http://example.com/1</link>
+  <updated>2024-05-01T10:00:00Z</updated>
+  <content:encoded>The encoded body of the first item</content:encoded>
+</item>
+<item>
+  <title>Description and encoded content</title>
+  <link>http://example.com/2</link>
+  <pubDate>Thu, 02 May 2024 10:00:00 GMT</pubDate>
+  <updated>2024-05-03T10:00:00Z</updated>
+  <description>A proper description for the second item</description>
+  <content:encoded>The encoded body of the second item</content:encoded>
+</item>
+<item>
+  <title>Short description</title>
+  <link>http://example.com/3</link>
+  <pubDate>Sat, 04 May 2024 10:00:00 GMT</pubDate>
+  <description>Short</description>
+  <content:encoded>The encoded body of the third item</content:encoded>
+</item>
+<item>
+  <title>Plain description</title>
+  <link>http://example.com/4</link>
+  <pubDate>Sun, 05 May 2024 10:00:00 GMT</pubDate>
+  <description>A proper description for the fourth item</description>
+  <content:encoded>The encoded body of the fourth item</content:encoded>
+</item>
+</channel>
+</rss>
+"""
+
+def fields(articles):
+    """The fields extraction decides, in feed order"""
+    return [(a['url'], a['published_at'], a['summary']) for a in articles]
+
+def main():
+    print("🕒 Testing feed profiles against a mixed feed")
+    print("=" * 50)
+    
+    scraper = RSSFeedScraper()
+    probed = fields(scraper._parse_feed_content(MIXED_FEED, FEED_URL))
+    
+    failures = 0
+    profile = FeedProfile(FEED_URL)
+    # The first pass learns the profile, the second starts out with it
+    for run in ("learning", "profiled"):
+        profiled = fields(scraper._parse_feed_content(MIXED_FEED, FEED_URL, profile=profile))
+        if profiled == probed:
+            print(f"✅ {run} pass: {len(profiled)} articles match the probed ones")
+        else:
+            print(f"❌ {run} pass differs from probing:")
+            for got, expected in zip(profiled, probed):
+                if got != expected:
+                    print(f"   {got} != {expected}")
+            failures += 1
+    
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())